@@ -0,0 +1,71 @@
+"""Memory held by 10k converted records: nested dicts from
+convert_to_dictionary versus the __slots__ model from convert_to_record.
+
+Each mode runs in a fresh interpreter. Python heap is measured with
+tracemalloc, the RSS growth also includes parsed trees that are kept alive
+by lxml string results referenced from the output.
+
+    python benchmarks/bench_model.py [--records 10000]
+"""
+import argparse
+import resource
+import subprocess
+import sys
+import tracemalloc
+from pathlib import Path
+
+EXAMPLE_DIR = Path(__file__).resolve().parent.parent / "example"
+MODES = ("dict", "model")
+
+
+def convertible_examples():
+    from iso19139_nl_reader.metadata_record import MetadataRecord
+    documents = []
+    for path in sorted(EXAMPLE_DIR.glob("*.xml")):
+        try:
+            if MetadataRecord.from_path(path).convert_to_dictionary() is not None:
+                documents.append(path.read_bytes())
+        except ValueError:
+            continue
+    return documents
+
+
+def run_mode(mode, count):
+    from iso19139_nl_reader.metadata_record import MetadataRecord
+    documents = convertible_examples()
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    tracemalloc.start()
+    results = []
+    for index in range(count):
+        record = MetadataRecord.from_bytes(documents[index % len(documents)])
+        if mode == "dict":
+            results.append(record.convert_to_dictionary())
+        else:
+            results.append(record.convert_to_record())
+        del record
+    heap, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_growth = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before
+    print(f"{heap / 1024 / 1024} {rss_growth / 1024}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=10000)
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.mode:
+        run_mode(args.mode, args.records)
+        return
+    print(f"{args.records} records")
+    print(f"{'mode':6} {'python heap (MB)':>17} {'RSS growth (MB)':>16}")
+    for mode in MODES:
+        output = subprocess.run(
+            [sys.executable, __file__, "--mode", mode, "--records", str(args.records)],
+            check=True, stdout=subprocess.PIPE, universal_newlines=True).stdout
+        heap, rss = (float(value) for value in output.split())
+        print(f"{mode:6} {heap:17.1f} {rss:16.1f}")
+
+
+if __name__ == "__main__":
+    main()
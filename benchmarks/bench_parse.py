@@ -0,0 +1,82 @@
+"""Parse time and peak RSS of the MetadataRecord constructors on a large
+record, built by repeating the keywords of example/19119_2.0.xml.
+
+Every constructor runs in a fresh interpreter so peak RSS is not shared.
+The "legacy" mode repeats what the reader did before: read as text,
+re-encode, keep the bytes, and parse twice more for validation.
+
+    python benchmarks/bench_parse.py [--size-mb 50]
+"""
+import argparse
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+EXAMPLE = Path(__file__).resolve().parent.parent / "example" / "19119_2.0.xml"
+MODES = ("legacy", "text", "bytes", "file", "path", "mmap")
+
+
+def build_large_record(path, size_mb):
+    text = EXAMPLE.read_text(encoding="utf-8")
+    keyword = re.search(r"<gmd:keyword>.*?</gmd:keyword>", text, re.S).group(0)
+    repeat = max(1, (size_mb * 1024 * 1024) // len(keyword))
+    text = text.replace(keyword, keyword * repeat, 1)
+    path.write_text(text, encoding="utf-8")
+
+
+def run_mode(mode, path):
+    import lxml.etree as et
+    from iso19139_nl_reader.metadata_record import MetadataRecord
+    start = time.perf_counter()
+    if mode == "legacy":
+        with open(path, "r", encoding="utf-8") as md_file:
+            record = MetadataRecord(md_file, keep_bytes=True)
+        et.fromstring(record.xml_string)
+        et.fromstring(record.xml_string, et.XMLParser(ns_clean=True, recover=True, encoding="utf-8"))
+    elif mode == "text":
+        with open(path, "r", encoding="utf-8") as md_file:
+            record = MetadataRecord(md_file)
+    elif mode == "bytes":
+        record = MetadataRecord.from_bytes(Path(path).read_bytes())
+    elif mode == "file":
+        with open(path, "rb") as md_file:
+            record = MetadataRecord.from_file(md_file)
+    elif mode == "path":
+        record = MetadataRecord.from_path(path)
+    elif mode == "mmap":
+        record = MetadataRecord.from_mmap(path)
+    record.validate_xml_form()
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{elapsed} {peak_mb}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-mb", type=int, default=50)
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--path", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.mode:
+        run_mode(args.mode, args.path)
+        return
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / "large.xml"
+        build_large_record(path, args.size_mb)
+        size_mb = path.stat().st_size / 1024 / 1024
+        print(f"record size: {size_mb:.1f} MB")
+        print(f"{'mode':8} {'parse (s)':>10} {'peak RSS (MB)':>14}")
+        for mode in MODES:
+            output = subprocess.run(
+                [sys.executable, __file__, "--mode", mode, "--path", str(path)],
+                check=True, stdout=subprocess.PIPE, universal_newlines=True).stdout
+            elapsed, peak_mb = (float(value) for value in output.split())
+            print(f"{mode:8} {elapsed:10.3f} {peak_mb:14.1f}")
+
+
+if __name__ == "__main__":
+    main()
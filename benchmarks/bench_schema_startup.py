@@ -0,0 +1,56 @@
+"""Validation startup: time to compile each schema profile through the
+offline resolver in a fresh interpreter (bundled files read from disk), a
+second compile in the same process (documents served from memory) and the
+first validation. Any resource that is not bundled makes compilation fail,
+so the timings are without network access.
+
+    python benchmarks/bench_schema_startup.py
+"""
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+EXAMPLE = Path(__file__).resolve().parent.parent / "example" / "19119_2.0.xml"
+
+
+def run_profile(profile):
+    import lxml.etree as et
+    from iso19139_nl_reader import schema_resolver
+    from iso19139_nl_reader.schema_registry import compile_schema, get_schema_path
+    start = time.perf_counter()
+    schema = compile_schema(get_schema_path(profile))
+    cold = time.perf_counter() - start
+    start = time.perf_counter()
+    compile_schema(get_schema_path(profile))
+    warm = time.perf_counter() - start
+    tree = et.parse(str(EXAMPLE))
+    start = time.perf_counter()
+    schema.validate(tree)
+    validate = time.perf_counter() - start
+    print(json.dumps({
+        "profile": profile,
+        "cold_compile_ms": round(cold * 1000, 1),
+        "cached_compile_ms": round(warm * 1000, 1),
+        "first_validation_ms": round(validate * 1000, 1),
+        "bundled_documents": len(schema_resolver._documents),
+    }))
+
+
+def main():
+    if len(sys.argv) > 1:
+        run_profile(sys.argv[1])
+        return
+    from iso19139_nl_reader.schema_registry import SCHEMA_PROFILES
+    print(f"{'profile':8} {'cold (ms)':>10} {'cached (ms)':>12} {'validate (ms)':>14} {'documents':>10}")
+    for profile in SCHEMA_PROFILES:
+        output = subprocess.run(
+            [sys.executable, __file__, profile], check=True, stdout=subprocess.PIPE, universal_newlines=True).stdout
+        result = json.loads(output)
+        print(f"{profile:8} {result['cold_compile_ms']:10.1f} {result['cached_compile_ms']:12.1f} "
+              f"{result['first_validation_ms']:14.1f} {result['bundled_documents']:10d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Start up time of short CLI invocations: wall time of `read` and
+`validate` on a single record and of `--help`, and the import time from
+`python -X importtime`, with the heaviest imports per command. Results are
+written as JSON, and --compare checks them against an earlier run:
+
+    python benchmarks/bench_startup.py --output startup.json
+    python benchmarks/bench_startup.py --compare startup.json --threshold 0.2
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+EXAMPLE = Path(__file__).resolve().parent.parent / "example" / "19119_2.0.xml"
+COMMANDS = {
+    "help": ["--help"],
+    "read": ["read", str(EXAMPLE)],
+    "validate": ["validate", str(EXAMPLE)],
+}
+
+
+def parse_importtime(stderr):
+    # lines are "import time: self [us] | cumulative | imported package",
+    # nesting is shown by indentation of the package name
+    total = 0
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name.startswith("  "):
+            total += int(cumulative)
+        modules.append((int(cumulative), name.strip()))
+    return total, modules
+
+
+def run_command(args, repeat):
+    command = [sys.executable, "-m", "iso19139_nl_reader.cli"] + args
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime"] + command[1:], stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+        universal_newlines=True).stderr
+    import_us, modules = parse_importtime(stderr)
+    return {
+        "wall_ms": round(statistics.median(timings) * 1000, 1),
+        "import_ms": round(import_us / 1000, 1),
+        "heaviest_imports": [
+            {"module": name, "ms": round(cumulative / 1000, 1)}
+            for cumulative, name in sorted(modules, reverse=True)[:5]
+        ],
+    }
+
+
+def compare(current, baseline, threshold):
+    # a command regresses when its wall or import time grows by more than
+    # threshold (fraction) compared to the baseline
+    regressions = []
+    for command, result in current["results"].items():
+        previous = baseline["results"].get(command)
+        if previous is None:
+            continue
+        wall = result["wall_ms"] / previous["wall_ms"]
+        imports = result["import_ms"] / previous["import_ms"]
+        flag = ""
+        if wall > 1 + threshold or imports > 1 + threshold:
+            regressions.append(command)
+            flag = "REGRESSION"
+        print(f"{command:10} wall {wall:6.2f}x  imports {imports:6.2f}x  {flag}", file=sys.stderr)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--commands", nargs="+", choices=list(COMMANDS), default=list(COMMANDS))
+    parser.add_argument("--output", help="write results to this file instead of stdout")
+    parser.add_argument("--compare", help="results of an earlier run to compare with")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+    current = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": {command: run_command(COMMANDS[command], args.repeat) for command in args.commands},
+    }
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(current, output_file, indent=4)
+    else:
+        print(json.dumps(current, indent=4))
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        if compare(current, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Schema validation throughput of ValidationService against the number of
+workers, for the thread pool (pre-parsed trees) and the process pool
+(paths), on a synthetic corpus built from example/ (see corpus.py).
+
+    python benchmarks/bench_validation.py [--records 2000] [--workers 1 2 4 8]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+
+def run(executor, workers, paths, trees):
+    from iso19139_nl_reader.validation import ValidationService
+    with ValidationService(workers=workers, executor=executor) as service:
+        # compile the schema in every worker before timing
+        list(service.validate_batch(paths[:workers * 2]))
+        start = time.perf_counter()
+        results = list(service.validate_batch(trees if executor == "thread" else paths))
+        elapsed = time.perf_counter() - start
+    invalid = sum(not result.valid for result in results)
+    return elapsed, invalid
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, nargs="+")
+    args = parser.parse_args()
+    from corpus import write_corpus
+    import lxml.etree as et
+    workers = args.workers
+    if not workers:
+        cpus = os.cpu_count() or 1
+        workers = sorted({1, 2, 4, cpus} | {count for count in (8, 16) if count <= cpus})
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = [str(path) for path in write_corpus(tmp_dir, args.records, args.seed)]
+        trees = [et.parse(path) for path in paths]
+        print(f"{len(paths)} records, {os.cpu_count()} cpus")
+        print(f"{'executor':10} {'workers':>8} {'seconds':>10} {'records/s':>10} {'speedup':>8} {'invalid':>8}")
+        for executor in ("thread", "process"):
+            baseline = None
+            for count in workers:
+                elapsed, invalid = run(executor, count, paths, trees)
+                baseline = baseline or elapsed
+                print(f"{executor:10} {count:8d} {elapsed:10.3f} {len(paths) / elapsed:10.1f} "
+                      f"{baseline / elapsed:8.2f} {invalid:8d}")
+
+
+if __name__ == "__main__":
+    main()
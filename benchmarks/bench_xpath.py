@@ -0,0 +1,60 @@
+"""Per-record conversion time with string XPath evaluation versus the
+precompiled XPath registry, measured on the documents in example/.
+
+    python benchmarks/bench_xpath.py [--rounds 200]
+"""
+import argparse
+import io
+import time
+from pathlib import Path
+from iso19139_nl_reader.metadata_record import MetadataRecord
+from iso19139_nl_reader.xpath import NAMESPACES
+
+EXAMPLE_DIR = Path(__file__).resolve().parent.parent / "example"
+
+
+class StringXPathRecord(MetadataRecord):
+    # evaluation as it was before the registry: lxml parses and compiles the
+    # expression on every call
+    def get_xpath_result(self, xpath, etree=None):
+        if etree is None:
+            etree = self.etree
+        return etree.xpath(xpath, namespaces=NAMESPACES)
+
+
+def load_examples():
+    documents = {}
+    for path in sorted(EXAMPLE_DIR.glob("*.xml")):
+        text = path.read_text(encoding="utf-8")
+        try:
+            result = MetadataRecord(io.StringIO(text)).convert_to_dictionary()
+        except ValueError:
+            # skip records the reader rejects, they do not finish a conversion
+            continue
+        if result is None:
+            # unsupported hierarchyLevel, only the record type lookup would be timed
+            continue
+        documents[path.name] = text
+    return documents
+
+
+def time_conversion(record_class, text, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        record_class(io.StringIO(text)).convert_to_dictionary()
+    return (time.perf_counter() - start) / rounds
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+    print(f"{'document':45} {'string (ms)':>12} {'compiled (ms)':>14} {'speedup':>8}")
+    for name, text in load_examples().items():
+        before = time_conversion(StringXPathRecord, text, args.rounds)
+        after = time_conversion(MetadataRecord, text, args.rounds)
+        print(f"{name:45} {before * 1000:12.3f} {after * 1000:14.3f} {before / after:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
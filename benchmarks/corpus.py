@@ -0,0 +1,156 @@
+"""Synthetic corpus generator, builds service and dataset records from the
+templates in example/ with varying numbers of srv:operatesOn, keywords,
+thumbnails and contacts, and with NL profile 1.2 or 2.0 license encoding.
+
+    python benchmarks/corpus.py OUTPUT_DIR --records 1000 [--csw RESPONSE_FILE]
+"""
+import argparse
+import copy
+import random
+import uuid
+from pathlib import Path
+import lxml.etree as et
+from iso19139_nl_reader.xpath import NAMESPACES, XPATH_RESOURCE_IDENTIFICATION
+
+EXAMPLE_DIR = Path(__file__).resolve().parent.parent / "example"
+TEMPLATES = {
+    "service": EXAMPLE_DIR / "19119_2.0_multiple_datasets.xml",
+    "dataset": EXAMPLE_DIR / "iso19139-inspire.xml",
+}
+GCO = NAMESPACES["gco"]
+XLINK = NAMESPACES["xlink"]
+
+
+def find(element, xpath):
+    return element.xpath(xpath, namespaces=NAMESPACES)
+
+
+def set_count(elements, count, customize):
+    # keep the first element as prototype and replace all elements with
+    # count customized copies at the same position
+    prototype = elements[0]
+    parent = prototype.getparent()
+    position = parent.index(prototype)
+    for element in elements:
+        element.getparent().remove(element)
+    for index in range(count):
+        element = copy.deepcopy(prototype)
+        customize(element, index)
+        parent.insert(position + index, element)
+
+
+class CorpusGenerator():
+    def __init__(self, seed=0, max_operateson=20, max_keywords=30, max_thumbnails=5, max_contacts=4):
+        self.random = random.Random(seed)
+        self.max_operateson = max_operateson
+        self.max_keywords = max_keywords
+        self.max_thumbnails = max_thumbnails
+        self.max_contacts = max_contacts
+        self.templates = {
+            record_type: et.parse(str(path)) for record_type, path in TEMPLATES.items()
+        }
+
+    def uuid(self):
+        return str(uuid.UUID(int=self.random.getrandbits(128), version=4))
+
+    def set_operateson(self, identification, count):
+        def customize(element, _):
+            dataset_id = self.uuid()
+            element.set("uuidref", self.uuid())
+            element.set(
+                f"{{{XLINK}}}href",
+                f"https://www.nationaalgeoregister.nl/geonetwork/srv/dut/csw?service=CSW&request=GetRecordById&id={dataset_id}")
+        set_count(find(identification, "srv:operatesOn"), count, customize)
+
+    def set_keywords(self, identification, count):
+        def customize(element, index):
+            element[0].text = f"keyword {index}"
+        keywords = find(identification, "gmd:descriptiveKeywords/gmd:MD_Keywords/gmd:keyword[gco:CharacterString]")
+        set_count(keywords[0].getparent().findall(keywords[0].tag), count, customize)
+
+    def set_thumbnails(self, identification, count):
+        def customize(element, index):
+            find(element, "gmd:MD_BrowseGraphic/gmd:fileName/gco:CharacterString")[0].text = \
+                f"https://example.com/thumbnails/{index}.png"
+        set_count(find(identification, "gmd:graphicOverview"), count, customize)
+
+    def set_contacts(self, identification, count):
+        def customize(element, index):
+            find(element, "gmd:CI_ResponsibleParty/gmd:organisationName/gco:CharacterString")[0].text = \
+                f"Organisation {index}"
+        set_count(find(identification, "gmd:pointOfContact"), count, customize)
+
+    def set_license_12(self, identification):
+        # NL profiel 1.2: description and url as two gco:CharacterString
+        # otherConstraints instead of a gmx:Anchor with xlink:href
+        url = None
+        for anchor in find(identification, "gmd:resourceConstraints/gmd:MD_LegalConstraints/gmd:otherConstraints/gmx:Anchor"):
+            string = et.Element(f"{{{GCO}}}CharacterString")
+            string.text = anchor.text
+            if url is None:
+                url = anchor.get(f"{{{XLINK}}}href")
+                url_string = et.Element(f"{{{GCO}}}CharacterString")
+                url_string.text = url
+                url_constraint = et.Element(anchor.getparent().tag)
+                url_constraint.append(url_string)
+                anchor.getparent().addnext(url_constraint)
+            anchor.getparent().replace(anchor, string)
+
+    def generate(self, record_type, profile="2.0"):
+        tree = copy.deepcopy(self.templates[record_type])
+        root = tree.getroot()
+        find(root, "/gmd:MD_Metadata/gmd:fileIdentifier/gco:CharacterString")[0].text = self.uuid()
+        identification = find(root, XPATH_RESOURCE_IDENTIFICATION[record_type])[0]
+        if record_type == "service":
+            self.set_operateson(identification, self.random.randint(0, self.max_operateson))
+        self.set_keywords(identification, self.random.randint(1, self.max_keywords))
+        self.set_thumbnails(identification, self.random.randint(1, self.max_thumbnails))
+        self.set_contacts(identification, self.random.randint(1, self.max_contacts))
+        if profile == "1.2":
+            self.set_license_12(identification)
+        return tree
+
+    def records(self, count, service_ratio=0.5, profile_12_ratio=0.5):
+        for _ in range(count):
+            record_type = "service" if self.random.random() < service_ratio else "dataset"
+            profile = "1.2" if self.random.random() < profile_12_ratio else "2.0"
+            yield self.generate(record_type, profile)
+
+
+def write_corpus(output_dir, count, seed=0, **kwargs):
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for index, tree in enumerate(CorpusGenerator(seed, **kwargs).records(count)):
+        path = output_dir / f"record_{index:06d}.xml"
+        tree.write(str(path), xml_declaration=True, encoding="UTF-8")
+        paths.append(path)
+    return paths
+
+
+def write_csw_response(path, count, seed=0, **kwargs):
+    # a single GetRecordsResponse with all records, for read-csw
+    csw = "http://www.opengis.net/cat/csw/2.0.2"
+    with et.xmlfile(str(path), encoding="UTF-8") as xml_file:
+        xml_file.write_declaration()
+        with xml_file.element(f"{{{csw}}}GetRecordsResponse", nsmap={"csw": csw}):
+            with xml_file.element(f"{{{csw}}}SearchResults", numberOfRecordsMatched=str(count),
+                                  numberOfRecordsReturned=str(count), nextRecord="0"):
+                for tree in CorpusGenerator(seed, **kwargs).records(count):
+                    xml_file.write(tree.getroot())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("output_dir")
+    parser.add_argument("--records", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--csw", help="also write the records as one GetRecords response to this file")
+    args = parser.parse_args()
+    write_corpus(args.output_dir, args.records, args.seed)
+    if args.csw:
+        write_csw_response(args.csw, args.records, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Benchmark suite: records per second and peak memory for sniffing, parsing,
+convert_to_dictionary, schema_validation_errors and end-to-end CLI runs on
+a synthetic corpus (see corpus.py).
+
+Every stage runs in a fresh interpreter. Results are written as JSON, and
+--compare checks them against an earlier run:
+
+    python benchmarks/run.py --records 2000 --output results.json
+    python benchmarks/run.py --records 2000 --compare results.json --threshold 0.2
+"""
+import argparse
+import json
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+STAGES = ("sniff", "parse", "convert", "validate", "cli-read", "cli-validate", "cli-read-csw")
+
+
+def run_stage(stage, corpus_dir, csw_response):
+    from iso19139_nl_reader.cli import cli
+    from iso19139_nl_reader.metadata_record import MetadataRecord
+    from iso19139_nl_reader.sniff import sniff
+    paths = sorted(str(path) for path in Path(corpus_dir).glob("*.xml"))
+    tracemalloc.start()
+    start = time.perf_counter()
+    if stage == "sniff":
+        for path in paths:
+            sniff(path)
+    elif stage == "parse":
+        for path in paths:
+            MetadataRecord.from_path(path)
+    elif stage in ("convert", "validate"):
+        # parsing is not part of these stages
+        records = [MetadataRecord.from_path(path) for path in paths]
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+        for record in records:
+            if stage == "convert":
+                record.convert_to_dictionary()
+            else:
+                record.schema_validation_errors()
+    else:
+        args = {
+            "cli-read": ["read", corpus_dir, "--output", "/dev/null"],
+            "cli-validate": ["validate", corpus_dir, "--output", "/dev/null"],
+            "cli-read-csw": ["read-csw", csw_response, "--output", "/dev/null"],
+        }[stage]
+        tracemalloc.stop()
+        try:
+            cli.main(args, standalone_mode=False)
+        except SystemExit:
+            # exit status 1 only means some records failed or were invalid
+            pass
+    elapsed = time.perf_counter() - start
+    heap_peak = tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else None
+    result = {
+        "records": len(paths),
+        "seconds": round(elapsed, 4),
+        "records_per_second": round(len(paths) / elapsed, 1),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "peak_heap_mb": round(heap_peak / 1024 / 1024, 1) if heap_peak is not None else None,
+    }
+    print(json.dumps(result))
+
+
+def run_suite(records, stages, seed):
+    from corpus import write_corpus, write_csw_response
+    import lxml.etree as et
+    from iso19139_nl_reader import __version__
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        corpus_dir = Path(tmp_dir) / "corpus"
+        csw_response = Path(tmp_dir) / "response.xml"
+        write_corpus(corpus_dir, records, seed)
+        write_csw_response(csw_response, records, seed)
+        for stage in stages:
+            output = subprocess.run(
+                [sys.executable, __file__, "--stage", stage, "--corpus", str(corpus_dir), "--csw", str(csw_response)],
+                check=True, stdout=subprocess.PIPE, universal_newlines=True).stdout
+            results[stage] = json.loads(output.strip().splitlines()[-1])
+    return {
+        "meta": {
+            "version": __version__,
+            "python": platform.python_version(),
+            "lxml": ".".join(str(part) for part in et.LXML_VERSION),
+            "platform": platform.platform(),
+            "records": records,
+            "seed": seed,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold):
+    # a stage regresses when throughput drops or peak RSS grows by more than
+    # threshold (fraction) compared to the baseline
+    regressions = []
+    for stage, result in current["results"].items():
+        previous = baseline["results"].get(stage)
+        if previous is None:
+            continue
+        speed = result["records_per_second"] / previous["records_per_second"]
+        memory = result["peak_rss_mb"] / previous["peak_rss_mb"]
+        flag = ""
+        if speed < 1 - threshold or memory > 1 + threshold:
+            regressions.append(stage)
+            flag = "REGRESSION"
+        print(f"{stage:14} throughput {speed:6.2f}x  peak RSS {memory:6.2f}x  {flag}", file=sys.stderr)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument("--output", help="write results to this file instead of stdout")
+    parser.add_argument("--compare", help="results of an earlier run to compare with")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--stage", choices=STAGES, help=argparse.SUPPRESS)
+    parser.add_argument("--corpus", help=argparse.SUPPRESS)
+    parser.add_argument("--csw", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.stage:
+        run_stage(args.stage, args.corpus, args.csw)
+        return
+    current = run_suite(args.records, args.stages, args.seed)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(current, output_file, indent=4)
+    else:
+        print(json.dumps(current, indent=4))
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        if compare(current, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
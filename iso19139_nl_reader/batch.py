@@ -0,0 +1,201 @@
+import glob
+import multiprocessing
+import os
+import time
+from .cache import DEFAULT_MAX_SIZE, ConversionCache, cache_key, read_kind, validate_kind
+from .issues import IssueCounts
+from .metadata_record import MetadataRecord, convert_record
+from .profiling import profiler
+from .schema_registry import DEFAULT_PROFILE, schema_registry
+from .util import GLOB_CHARS
+
+
+def collect_sources(paths, file_list=None, require_matches=False):
+    # expand directories (recursively) and glob patterns into a sorted,
+    # de-duplicated list of files, file list entries are kept in given order;
+    # with require_matches a directory or pattern without documents raises
+    # FileNotFoundError
+    sources = []
+    for path in paths:
+        if os.path.isdir(path):
+            found = glob.glob(os.path.join(path, "**", "*.xml"), recursive=True)
+        elif any(char in path for char in GLOB_CHARS):
+            found = glob.glob(path, recursive=True)
+        else:
+            found = [path]
+        if require_matches and not found:
+            raise FileNotFoundError(f"{path!r}: no metadata documents found")
+        sources.extend(sorted(found))
+    if file_list is not None:
+        for line in file_list:
+            line = line.strip()
+            if line:
+                sources.append(line)
+    seen = set()
+    result = []
+    for source in sources:
+        if source not in seen:
+            seen.add(source)
+            result.append(source)
+    return result
+
+
+# per process conversion cache, opened by init_worker
+worker_cache = None
+
+
+def init_worker(schema=None, cache_dir=None, cache_size=DEFAULT_MAX_SIZE, profile=False):
+    # called once per worker process, so schema compilation is not repeated
+    # for every file handled by the worker
+    global worker_cache
+    if profile:
+        profiler.enable()
+    if schema is not None:
+        # compiling is the expensive part of loading the schema
+        profiler.call("validate.schema_load", schema_registry.warm_up, [schema])
+    # a single worker batch runs in the calling process, so the cache of an
+    # earlier batch must not carry over
+    if worker_cache is not None:
+        worker_cache.close()
+    worker_cache = ConversionCache(cache_dir, cache_size) if cache_dir is not None else None
+
+
+def convert_bytes(data, cache=None, collect_issues=False):
+    # failed conversions raise and are not cached; returns {"result"} and,
+    # when collecting issues, {"issues"}
+    if cache is None:
+        return convert_record(MetadataRecord.from_bytes(data), collect_issues)
+    key = cache_key(data, read_kind(collect_issues))
+    result = cache.get(key)
+    if result is None:
+        result = convert_record(MetadataRecord.from_bytes(data), collect_issues)
+        cache.put(key, result)
+    return result
+
+
+def validate_bytes(data, schema=DEFAULT_PROFILE, cache=None):
+    if cache is None:
+        return MetadataRecord.from_bytes(data).schema_validation_errors(schema)
+    key = cache_key(data, validate_kind(schema))
+    result = cache.get(key)
+    if result is None:
+        result = {"errors": MetadataRecord.from_bytes(data).schema_validation_errors(schema)}
+        cache.put(key, result)
+    return result["errors"]
+
+
+def read_file(path, collect_issues=False):
+    try:
+        if worker_cache is None:
+            return {"file": path, **convert_record(MetadataRecord.from_path(path), collect_issues)}
+        with open(path, "rb") as md_file:
+            return {"file": path, **convert_bytes(md_file.read(), worker_cache, collect_issues)}
+    except Exception as err:
+        return {"file": path, "error": f"{type(err).__name__}: {err}"}
+
+
+def validate_file(path, schema=DEFAULT_PROFILE):
+    try:
+        if worker_cache is None:
+            errors = MetadataRecord.from_path(path).schema_validation_errors(schema)
+        else:
+            with open(path, "rb") as md_file:
+                errors = validate_bytes(md_file.read(), schema, worker_cache)
+        return {"file": path, "valid": not errors, "errors": errors}
+    except Exception as err:
+        return {"file": path, "error": f"{type(err).__name__}: {err}"}
+
+
+class _ReadTask():
+    def __init__(self, collect_issues):
+        self.collect_issues = collect_issues
+
+    def __call__(self, path):
+        return read_file(path, self.collect_issues)
+
+
+class _ValidateTask():
+    # picklable callable, so the schema profile reaches the worker processes
+    def __init__(self, schema):
+        self.schema = schema
+
+    def __call__(self, path):
+        return validate_file(path, self.schema)
+
+
+class BatchSummary():
+    def __init__(self):
+        self.total = 0
+        self.failed = 0
+        self.start = time.perf_counter()
+        self.elapsed = 0.0
+        self.issues = None
+
+    def add(self, result):
+        self.total += 1
+        if "error" in result or result.get("valid") is False:
+            self.failed += 1
+        if "issues" in result:
+            if self.issues is None:
+                self.issues = IssueCounts()
+            self.issues.add(result["issues"])
+        self.elapsed = time.perf_counter() - self.start
+
+    @property
+    def throughput(self):
+        if not self.elapsed:
+            return 0.0
+        return self.total / self.elapsed
+
+    def to_dict(self):
+        return {
+            "total": self.total,
+            "succeeded": self.total - self.failed,
+            "failed": self.failed,
+            "elapsed": round(self.elapsed, 3),
+            "records_per_second": round(self.throughput, 1),
+            **({"issues": self.issues.to_dict()} if self.issues is not None else {}),
+        }
+
+    @property
+    def records_with_errors(self):
+        return self.issues.records_with_errors if self.issues is not None else 0
+
+
+class _ProfiledTask():
+    # returns the worker's timings along with each result, so they can be
+    # merged into the profiler of the main process
+    def __init__(self, task):
+        self.task = task
+
+    def __call__(self, source):
+        result = self.task(source)
+        return result, profiler.drain()
+
+
+def run_batch(task, sources, workers=1, schema=None, cache_dir=None, cache_size=DEFAULT_MAX_SIZE, chunksize=8):
+    # results are yielded in the order of sources, whatever the number of workers
+    if workers <= 1:
+        init_worker(schema, cache_dir, cache_size)
+        for source in sources:
+            yield task(source)
+        return
+    profile = profiler.enabled
+    initargs = (schema, cache_dir, cache_size, profile)
+    if profile:
+        task = _ProfiledTask(task)
+    with multiprocessing.Pool(workers, initializer=init_worker, initargs=initargs) as pool:
+        for result in pool.imap(task, sources, chunksize=chunksize):
+            if profile:
+                result, timings = result
+                profiler.merge(timings)
+            yield result
+
+
+def read_batch(sources, workers=1, cache_dir=None, cache_size=DEFAULT_MAX_SIZE, collect_issues=False):
+    task = _ReadTask(collect_issues) if collect_issues else read_file
+    return run_batch(task, sources, workers, cache_dir=cache_dir, cache_size=cache_size)
+
+
+def validate_batch(sources, workers=1, schema=DEFAULT_PROFILE, cache_dir=None, cache_size=DEFAULT_MAX_SIZE):
+    return run_batch(_ValidateTask(schema), sources, workers, schema, cache_dir, cache_size)
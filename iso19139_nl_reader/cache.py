@@ -0,0 +1,113 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from . import __version__
+from .schema_registry import SCHEMA_PROFILES
+
+CACHE_FILE = "conversion-cache.sqlite"
+DEFAULT_MAX_SIZE = 512 * 1024 * 1024
+
+
+def read_kind(collect_issues=False):
+    return "read:issues" if collect_issues else "read"
+
+
+def validate_kind(profile):
+    # the schema path holds the schema version, e.g. apiso/1.0.0
+    return f"validate:{profile}:{SCHEMA_PROFILES[profile]}"
+
+
+def cache_key(data, kind):
+    # keyed by the input bytes, the library version and what is cached
+    digest = hashlib.sha256()
+    digest.update(f"{__version__}\0{kind}\0".encode("utf-8"))
+    digest.update(data)
+    return digest.hexdigest()
+
+
+class ConversionCache():
+    # persistent cache of conversion and validation results in a SQLite
+    # database, least recently used entries are evicted once the stored
+    # values exceed max_size bytes; safe to share between worker processes
+    def __init__(self, cache_dir, max_size=DEFAULT_MAX_SIZE):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, CACHE_FILE)
+        self.max_size = max_size
+        self.connection = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)")
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        self.connection.execute(
+            "INSERT OR IGNORE INTO counters (name, value) VALUES ('hits', 0), ('misses', 0), ('evictions', 0), ('size', 0)")
+        # a smaller max_size than in earlier runs applies right away
+        with self.connection:
+            self.connection.execute("BEGIN IMMEDIATE")
+            self.evict()
+
+    def _count(self, name, amount=1):
+        self.connection.execute(
+            "UPDATE counters SET value = value + ? WHERE name = ?", (amount, name))
+
+    def get(self, key):
+        row = self.connection.execute(
+            "SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self._count("misses")
+            return None
+        self.connection.execute(
+            "UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+        self._count("hits")
+        return json.loads(row[0])
+
+    def put(self, key, value):
+        value = json.dumps(value)
+        with self.connection:
+            self.connection.execute("BEGIN IMMEDIATE")
+            row = self.connection.execute(
+                "SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            self.connection.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, value, len(value), time.time()))
+            self._count("size", len(value) - (row[0] if row else 0))
+            self.evict()
+
+    def size(self):
+        return self.connection.execute(
+            "SELECT value FROM counters WHERE name = 'size'").fetchone()[0]
+
+    def evict(self):
+        excess = self.size() - self.max_size
+        if excess <= 0:
+            return
+        keys = []
+        freed = 0
+        for key, size in self.connection.execute(
+                "SELECT key, size FROM entries ORDER BY last_access"):
+            if freed >= excess:
+                break
+            keys.append((key,))
+            freed += size
+        self.connection.executemany("DELETE FROM entries WHERE key = ?", keys)
+        self._count("size", -freed)
+        self._count("evictions", len(keys))
+
+    def clear(self):
+        self.connection.execute("DELETE FROM entries")
+        self.connection.execute("UPDATE counters SET value = 0")
+
+    def stats(self):
+        counters = dict(self.connection.execute("SELECT name, value FROM counters"))
+        entries = self.connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        counters.update({"entries": entries, "size": self.size(), "max_size": self.max_size})
+        return counters
+
+    def close(self):
+        self.connection.close()
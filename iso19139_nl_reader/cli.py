@@ -1,8 +1,143 @@
 import json
-import sys
-from .metadata_record import MetadataRecord
+from .columnar import TABLE_FORMATS
+from .incremental import COMPARE_MODES
+from .issues import ERROR
+from .schema_registry import DEFAULT_PROFILE, SCHEMA_PROFILES
+from .profiling import PROFILE_FORMATS, profiler
+from .serialize import BACKENDS, FORMATS, JsonWriter, open_output
+from .util import is_batch_source
 import click
 
+# only modules needed to declare the commands are imported above, lxml,
+# multiprocessing, sqlite3 and the conversion code are imported by the
+# command that is run, which keeps start up of short invocations fast
+
+
+def is_batch(md_files, file_list):
+    if file_list is not None or len(md_files) > 1:
+        return True
+    return any(is_batch_source(md_file) for md_file in md_files)
+
+
+def batch_sources(md_files, file_list):
+    # a directory or glob pattern without documents is a usage error rather
+    # than an empty batch
+    from .batch import collect_sources
+    try:
+        return collect_sources(md_files, file_list, require_matches=True)
+    except FileNotFoundError as err:
+        raise click.BadParameter(str(err), param_hint="'MD_FILES'")
+
+
+def open_source(md_files):
+    # the single document or stdin; a missing file is reported as usage
+    # error, as click.File does
+    path = md_files[0] if md_files else "-"
+    try:
+        return click.open_file(path, 'rb')
+    except OSError as err:
+        raise click.BadParameter(
+            f"{click.format_filename(path)!r}: {err.strerror}", param_hint="'MD_FILES'")
+
+
+def output_options(command):
+    command = click.option(
+        '--json-backend',
+        type=click.Choice(BACKENDS),
+        default="auto",
+        help="json serializer, auto uses orjson when installed"
+        )(command)
+    command = click.option(
+        '--output', '-o',
+        type=click.Path(dir_okay=False, writable=True),
+        default="-",
+        help="output file, defaults to stdout"
+        )(command)
+    command = click.option(
+        '--format', 'output_format',
+        type=click.Choice(FORMATS),
+        help="output format, pretty for a single record and jsonl in batch mode by default"
+        )(command)
+    return command
+
+
+def output_requested(output_format, output, json_backend):
+    # whether any of output_options differs from its default, for commands
+    # whose single record output is plain text by default
+    return output != "-" or output_format is not None or json_backend != "auto"
+
+
+def profile_options(command):
+    command = click.option(
+        '--profile-format',
+        type=click.Choice(PROFILE_FORMATS),
+        default="text",
+        help="format of the --profile report"
+        )(command)
+    command = click.option(
+        '--profile',
+        is_flag=True,
+        help="print wall time and call counts per extraction and validation step to stderr"
+        )(command)
+    return command
+
+
+def start_profile(profile):
+    if profile:
+        profiler.reset()
+        profiler.enable()
+
+
+def report_profile(profile_format):
+    if profiler.enabled:
+        click.echo(profiler.format(profile_format), err=True)
+
+
+def cache_options(command):
+    command = click.option(
+        '--cache-size',
+        type=int,
+        default=512,
+        help="maximum size of the conversion cache in MB"
+        )(command)
+    command = click.option(
+        '--cache-dir',
+        type=click.Path(file_okay=False),
+        help="directory of the conversion cache, results are cached when set"
+        )(command)
+    return command
+
+
+def cache_stats_delta(before, after):
+    return {
+        "hits": after["hits"] - before["hits"],
+        "misses": after["misses"] - before["misses"],
+        "evictions": after["evictions"] - before["evictions"],
+        "entries": after["entries"],
+        "size": after["size"],
+    }
+
+
+def write_batch(results, output="-", output_format=None, json_backend="auto", cache_dir=None, profile_format="text"):
+    # documents go to the output, summary to stderr so stdout stays parseable
+    from .batch import BatchSummary
+    from .cache import ConversionCache
+    summary = BatchSummary()
+    cache = ConversionCache(cache_dir) if cache_dir is not None else None
+    cache_stats = cache.stats() if cache is not None else None
+    with open_output(output) as stream:
+        writer = JsonWriter(stream, output_format or "jsonl", json_backend)
+        for result in results:
+            summary.add(result)
+            writer.write(result)
+    summary_dict = summary.to_dict()
+    if cache is not None:
+        summary_dict["cache"] = cache_stats_delta(cache_stats, cache.stats())
+        cache.close()
+    click.echo(json.dumps({"summary": summary_dict}), err=True)
+    report_profile(profile_format)
+    return summary
+
 
 @click.group()
 def cli():
@@ -10,32 +145,316 @@ def cli():
 
 
 @cli.command(name="read")
-@click.argument(
-    'md-file', 
+@click.argument('md-files', nargs=-1)
+@click.option(
+    '--file-list',
     type=click.File('r'),
-    default=sys.stdin
+    help="file containing paths of metadata documents, one per line"
+    )
+@click.option(
+    '--workers',
+    type=int,
+    default=1,
+    help="number of worker processes in batch mode"
+    )
+@click.option(
+    '--collect-issues',
+    is_flag=True,
+    help="do not stop at the first conversion error, output partial results with the errors and warnings per field"
     )
-def read_metadata_command(md_file):
-    service_record = MetadataRecord(md_file)
-    result = service_record.convert_to_dictionary()
-    print(json.dumps(result, indent=4))
+@output_options
+@cache_options
+@profile_options
+def read_metadata_command(md_files, file_list, workers, collect_issues, output_format, output, json_backend, cache_dir,
+                          cache_size, profile, profile_format):
+    start_profile(profile)
+    cache_size = cache_size * 1024 * 1024
+    if is_batch(md_files, file_list):
+        from .batch import read_batch
+        sources = batch_sources(md_files, file_list)
+        results = read_batch(sources, workers, cache_dir, cache_size, collect_issues)
+        summary = write_batch(results, output, output_format, json_backend, cache_dir, profile_format)
+        if summary.failed or summary.records_with_errors:
+            exit(1)
+        return
+    with open_source(md_files) as md_file:
+        if cache_dir is not None:
+            from .batch import convert_bytes
+            from .cache import ConversionCache
+            result = convert_bytes(md_file.read(), ConversionCache(cache_dir, cache_size), collect_issues)
+        else:
+            from .metadata_record import MetadataRecord, convert_record
+            result = convert_record(MetadataRecord.from_file(md_file), collect_issues)
+    with open_output(output) as stream:
+        JsonWriter(stream, output_format or "pretty", json_backend).write(
+            result if collect_issues else result["result"])
+    report_profile(profile_format)
+    if collect_issues and any(issue["severity"] == ERROR for issue in result["issues"]):
+        exit(1)
 
 
 @cli.command(name="validate")
-@click.argument(
-    'md-file', 
+@click.argument('md-files', nargs=-1)
+@click.option(
+    '--schema',
+    type=click.Choice(list(SCHEMA_PROFILES)),
+    default=DEFAULT_PROFILE,
+    help="schema profile to validate against"
+    )
+@click.option(
+    '--file-list',
     type=click.File('r'),
-    default=sys.stdin
+    help="file containing paths of metadata documents, one per line"
     )
-def validate_metadata_command(md_file):
-    service_record = MetadataRecord(md_file)
-    result = service_record.schema_validation_errors()
-    if result:
+@click.option(
+    '--workers',
+    type=int,
+    default=1,
+    help="number of worker processes in batch mode"
+    )
+@output_options
+@cache_options
+@profile_options
+def validate_metadata_command(md_files, schema, file_list, workers, output_format, output, json_backend, cache_dir,
+                              cache_size, profile, profile_format):
+    start_profile(profile)
+    cache_size = cache_size * 1024 * 1024
+    if is_batch(md_files, file_list):
+        from .batch import validate_batch
+        sources = batch_sources(md_files, file_list)
+        results = validate_batch(sources, workers, schema, cache_dir, cache_size)
+        summary = write_batch(results, output, output_format, json_backend, cache_dir, profile_format)
+        if summary.failed:
+            exit(1)
+        return
+    with open_source(md_files) as md_file:
+        if cache_dir is not None:
+            from .batch import validate_bytes
+            from .cache import ConversionCache
+            result = validate_bytes(md_file.read(), schema, ConversionCache(cache_dir, cache_size))
+        else:
+            from .metadata_record import MetadataRecord
+            result = MetadataRecord.from_file(md_file).schema_validation_errors(schema)
+    report_profile(profile_format)
+    if output_requested(output_format, output, json_backend):
+        with open_output(output) as stream:
+            JsonWriter(stream, output_format or "pretty", json_backend).write({"valid": not result, "errors": result})
+        if result:
+            exit(1)
+    elif result:
         print(result)
         exit(1)
     else:
         print("metadata record is valid")
 
 
+def sniff_sources(sources):
+    from .sniff import sniff
+    for source in sources:
+        try:
+            yield {"file": source, "result": sniff(source).to_dict()}
+        except Exception as err:
+            yield {"file": source, "error": f"{type(err).__name__}: {err}"}
+
+
+@cli.command(name="sniff")
+@click.argument('md-files', nargs=-1)
+@click.option(
+    '--file-list',
+    type=click.File('r'),
+    help="file containing paths of metadata documents, one per line"
+    )
+@output_options
+def sniff_command(md_files, file_list, output_format, output, json_backend):
+    """Print hierarchyLevel, fileIdentifier, dateStamp and service protocol
+    of each document, reading only as far as needed to find them."""
+    summary = write_batch(sniff_sources(batch_sources(md_files, file_list)), output, output_format, json_backend)
+    if summary.failed:
+        exit(1)
+
+
+def convert_csw_records(responses):
+    from .csw import iter_csw_responses
+    for response, record, error in iter_csw_responses(responses):
+        if error is not None:
+            yield {"file": response, "error": error}
+            continue
+        result = {"file": response, "md_identifier": record.metadata_id}
+        try:
+            result["result"] = record.convert_to_dictionary()
+        except Exception as err:
+            result["error"] = f"{type(err).__name__}: {err}"
+        yield result
+
+
+@cli.command(name="read-csw")
+@click.argument('responses', nargs=-1, required=True)
+@output_options
+@profile_options
+def read_csw_command(responses, output_format, output, json_backend, profile, profile_format):
+    """Convert the records in saved CSW GetRecords responses (files or
+    directories of paged responses) to JSON Lines."""
+    start_profile(profile)
+    summary = write_batch(
+        convert_csw_records(responses), output, output_format, json_backend, profile_format=profile_format)
+    if summary.failed:
+        exit(1)
+
+
+def iter_records(md_files, file_list, csw, failed):
+    from .csw import iter_csw_responses
+    from .metadata_record import MetadataRecord
+    if csw:
+        for response, record, error in iter_csw_responses(md_files):
+            if error is not None:
+                failed.append({"file": response, "error": error})
+                continue
+            yield record
+        return
+    for source in batch_sources(md_files, file_list):
+        try:
+            record = MetadataRecord.from_path(source)
+        except Exception as err:
+            failed.append({"file": source, "error": f"{type(err).__name__}: {err}"})
+            continue
+        yield record
+
+
+@cli.command(name="link-graph")
+@click.argument('index-file', type=click.Path(dir_okay=False))
+@click.argument('md-files', nargs=-1)
+@click.option(
+    '--file-list',
+    type=click.File('r'),
+    help="file containing paths of metadata documents, one per line"
+    )
+@click.option(
+    '--csw',
+    is_flag=True,
+    help="MD_FILES are saved CSW GetRecords responses"
+    )
+@click.option(
+    '--rebuild',
+    is_flag=True,
+    help="start from an empty index instead of updating INDEX_FILE"
+    )
+@click.option(
+    '--remove',
+    multiple=True,
+    metavar="ID",
+    help="fileIdentifier of a record deleted from the catalogue, can be repeated"
+    )
+@output_options
+def link_graph_command(index_file, md_files, file_list, csw, rebuild, remove, output_format, output, json_backend):
+    """Add the srv:operatesOn links of the given service records and the
+    given dataset records to the index in INDEX_FILE, remove the --remove
+    records, then report the dangling and mismatched references of the
+    whole index."""
+    from .linkgraph import LinkGraph, build_link_graph
+    graph = LinkGraph() if rebuild else LinkGraph.load(index_file)
+    for md_id in remove:
+        graph.remove(md_id)
+    failed = []
+    graph, skipped = build_link_graph(iter_records(md_files, file_list, csw, failed), graph)
+    graph.save(index_file)
+    report = graph.report()
+    report["skipped"] = skipped
+    report["failed"] = failed
+    with open_output(output) as stream:
+        JsonWriter(stream, output_format or "pretty", json_backend).write(report)
+
+
+@cli.command(name="export")
+@click.argument('output', type=click.Path())
+@click.argument('md-files', nargs=-1)
+@click.option(
+    '--file-list',
+    type=click.File('r'),
+    help="file containing paths of metadata documents, one per line"
+    )
+@click.option(
+    '--csw',
+    is_flag=True,
+    help="MD_FILES are saved CSW GetRecords responses"
+    )
+@click.option(
+    '--table-format',
+    type=click.Choice(TABLE_FORMATS),
+    default="npz",
+    help="npz (numpy) writes one file, parquet and arrow a directory with a file per table"
+    )
+def export_command(output, md_files, file_list, csw, table_format):
+    """Export the records to columnar tables in OUTPUT: the records with
+    bbox and dictionary encoded columns, and keywords, thumbnails and
+    linked datasets as child tables."""
+    from .columnar import ColumnarExport
+    failed = []
+    export = ColumnarExport().extend(iter_records(md_files, file_list, csw, failed))
+    export.write(output, table_format)
+    click.echo(json.dumps({"summary": {"total": export.count + len(failed), "failed": failed}}), err=True)
+    if failed:
+        exit(1)
+
+
+def convert_changes(index, sources, compare, workers):
+    from .batch import read_batch
+    from .incremental import DELETED, FAILED, diff_harvest
+    changes = list(diff_harvest(sources, index, compare))
+    for change, _, path, error in changes:
+        if change == FAILED:
+            yield {"change": change, "file": path, "error": error}
+    updates = [change for change in changes if change[0] not in (DELETED, FAILED)]
+    results = read_batch([path for _, _, path, _ in updates], workers)
+    for (change, key, path, entry), result in zip(updates, results):
+        if "error" in result:
+            # not indexed, so the record is picked up again by the next run
+            index.entries.pop(key, None)
+        else:
+            index.entries[key] = entry
+        yield {"change": change, "md_identifier": key, **result}
+    for change, key, _, _ in changes:
+        if change == DELETED:
+            index.entries.pop(key, None)
+            yield {"change": change, "md_identifier": key}
+
+
+@cli.command(name="read-incremental")
+@click.argument('index-file', type=click.Path(dir_okay=False))
+@click.argument('md-files', nargs=-1)
+@click.option(
+    '--file-list',
+    type=click.File('r'),
+    help="file containing paths of metadata documents, one per line"
+    )
+@click.option(
+    '--workers',
+    type=int,
+    default=1,
+    help="number of worker processes"
+    )
+@click.option(
+    '--compare',
+    type=click.Choice(COMPARE_MODES),
+    default="datestamp",
+    help="detect changes by dateStamp only, or by dateStamp and content hash"
+    )
+@output_options
+@profile_options
+def read_incremental_command(index_file, md_files, file_list, workers, compare, output_format, output, json_backend,
+                             profile, profile_format):
+    """Convert only the records added or changed since the run that wrote
+    INDEX_FILE and report deleted records, then update INDEX_FILE."""
+    from .incremental import HarvestIndex
+    start_profile(profile)
+    index = HarvestIndex.load(index_file)
+    sources = batch_sources(md_files, file_list)
+    summary = write_batch(
+        convert_changes(index, sources, compare, workers), output, output_format, json_backend,
+        profile_format=profile_format)
+    index.save(index_file)
+    if summary.failed:
+        exit(1)
+
+
 if __name__ == "__main__":
     cli()
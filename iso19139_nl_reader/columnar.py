@@ -0,0 +1,185 @@
+import os
+from array import array
+from .model import to_float, to_str
+
+TABLE_FORMATS = ("npz", "parquet", "arrow")
+
+# records table: string and dictionary encoded columns, bbox coordinates
+# are kept apart as one float64 array of shape (records, 4)
+STRING_COLUMNS = ("md_identifier", "title", "datestamp")
+CATEGORICAL_COLUMNS = (
+    "record_type", "ogc_service_type", "license_url", "inspire_theme_uri", "metadata_contact_role",
+    "resource_contact_role",
+)
+BBOX_COLUMNS = ("minx", "miny", "maxx", "maxy")
+# child tables: record is the row of the parent record
+CHILD_TABLES = {
+    "keywords": ("keyword",),
+    "thumbnails": ("file", "description", "filetype"),
+    "linked_datasets": ("dataset_md_identifier", "dataset_source_identifier"),
+}
+NAN = float("nan")
+
+
+# numpy and pyarrow are optional and slow to import, so they are imported
+# when a table is written
+def import_numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ValueError("numpy is not installed") from None
+    return numpy
+
+
+def import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.compute
+        import pyarrow.feather
+        import pyarrow.parquet
+    except ImportError:
+        raise ValueError("pyarrow is not installed") from None
+    return pyarrow
+
+
+class Categorical():
+    # dictionary encoding: int32 codes into categories, -1 for missing values
+    def __init__(self):
+        self.categories = []
+        self.codes = array("i")
+        self._index = {}
+
+    def append(self, value):
+        if value is None:
+            self.codes.append(-1)
+            return
+        value = str(value)
+        code = self._index.get(value)
+        if code is None:
+            code = self._index[value] = len(self.categories)
+            self.categories.append(value)
+        self.codes.append(code)
+
+
+class ChildTable():
+    def __init__(self, columns):
+        self.record = array("i")
+        self.columns = {name: [] for name in columns}
+
+    def append(self, row, values):
+        self.record.append(row)
+        for name, column in self.columns.items():
+            column.append(to_str(values.get(name)))
+
+
+class ColumnarExport():
+    # collects the fields of a batch of MetadataRecords straight into
+    # columns, without building a dictionary per record; numpy or pyarrow
+    # are only needed to write the result
+    def __init__(self):
+        self.count = 0
+        self.strings = {name: [] for name in STRING_COLUMNS}
+        self.categoricals = {name: Categorical() for name in CATEGORICAL_COLUMNS}
+        self.bbox = array("d")
+        self.keywords = ChildTable(CHILD_TABLES["keywords"])
+        self.thumbnails = ChildTable(CHILD_TABLES["thumbnails"])
+        self.linked_datasets = ChildTable(CHILD_TABLES["linked_datasets"])
+
+    def add(self, record):
+        # fields with conversion errors are exported as missing values
+        with record.non_strict():
+            self._add(record)
+
+    def _add(self, record):
+        row = self.count
+        self.count += 1
+        field = record.get_field
+        self.strings["md_identifier"].append(to_str(record.metadata_id))
+        supported = record.record_type in ("service", "dataset")
+        self.strings["title"].append(to_str(field("title")) if supported else None)
+        self.strings["datestamp"].append(to_str(field("datestamp")))
+        self.categoricals["record_type"].append(record.record_type)
+        self.categoricals["ogc_service_type"].append(field("ogc_service_type"))
+        if not supported:
+            # without identification info there is nothing else to extract
+            for name in CATEGORICAL_COLUMNS[2:]:
+                self.categoricals[name].append(None)
+            self.bbox.extend((NAN, NAN, NAN, NAN))
+            return
+        license = field("license")
+        self.categoricals["license_url"].append(license["url"] if license else None)
+        self.categoricals["inspire_theme_uri"].append(field("inspire_theme_uri"))
+        for name in ("metadata_contact", "resource_contact"):
+            contact = field(name)
+            self.categoricals[f"{name}_role"].append(contact["role"] if contact else None)
+        bbox = field("bbox") or {}
+        self.bbox.extend(to_float(bbox.get(name), NAN) for name in BBOX_COLUMNS)
+        for keyword in field("keywords") or ():
+            self.keywords.append(row, {"keyword": keyword})
+        for thumbnail in field("thumbnails") or ():
+            self.thumbnails.append(row, thumbnail)
+        if record.record_type == "service":
+            for linked_dataset in field("linked_datasets") or ():
+                self.linked_datasets.append(row, linked_dataset)
+
+    def extend(self, records):
+        for record in records:
+            self.add(record)
+        return self
+
+    def child_tables(self):
+        return {name: getattr(self, name) for name in CHILD_TABLES}
+
+    def to_numpy(self):
+        # {"table/column": ndarray}; strings are fixed width unicode arrays
+        # with "" for missing values, categorical columns are stored as
+        # column/codes and column/categories
+        numpy = import_numpy()
+        arrays = {}
+        for name, values in self.strings.items():
+            arrays[f"records/{name}"] = numpy.array([value or "" for value in values], dtype=str)
+        for name, categorical in self.categoricals.items():
+            arrays[f"records/{name}/codes"] = numpy.frombuffer(categorical.codes, dtype=numpy.int32)
+            arrays[f"records/{name}/categories"] = numpy.array(categorical.categories, dtype=str)
+        arrays["records/bbox"] = numpy.frombuffer(self.bbox, dtype=numpy.float64).reshape(-1, len(BBOX_COLUMNS))
+        for table_name, table in self.child_tables().items():
+            arrays[f"{table_name}/record"] = numpy.frombuffer(table.record, dtype=numpy.int32)
+            for name, values in table.columns.items():
+                arrays[f"{table_name}/{name}"] = numpy.array([value or "" for value in values], dtype=str)
+        return arrays
+
+    def to_arrow(self):
+        # {table name: pyarrow.Table}, categorical columns are dictionary arrays
+        pyarrow = import_pyarrow()
+        columns = {name: pyarrow.array(values, pyarrow.string()) for name, values in self.strings.items()}
+        for name, categorical in self.categoricals.items():
+            codes = pyarrow.array(categorical.codes, pyarrow.int32())
+            columns[name] = pyarrow.DictionaryArray.from_arrays(
+                pyarrow.compute.if_else(pyarrow.compute.equal(codes, -1), None, codes),
+                pyarrow.array(categorical.categories, pyarrow.string()))
+        for index, name in enumerate(BBOX_COLUMNS):
+            columns[name] = pyarrow.array(self.bbox[index::len(BBOX_COLUMNS)], pyarrow.float64())
+        tables = {"records": pyarrow.table(columns)}
+        for table_name, table in self.child_tables().items():
+            child_columns = {"record": pyarrow.array(table.record, pyarrow.int32())}
+            child_columns.update(
+                (name, pyarrow.array(values, pyarrow.string())) for name, values in table.columns.items())
+            tables[table_name] = pyarrow.table(child_columns)
+        return tables
+
+    def write(self, path, table_format="npz"):
+        # npz: one file; parquet and arrow: a directory with a file per table
+        if table_format not in TABLE_FORMATS:
+            raise ValueError(f"unknown table format: {table_format}")
+        if table_format == "npz":
+            arrays = self.to_numpy()
+            import_numpy().savez_compressed(path, **arrays)
+            return
+        tables = self.to_arrow()
+        pyarrow = import_pyarrow()
+        os.makedirs(path, exist_ok=True)
+        for name, table in tables.items():
+            if table_format == "parquet":
+                pyarrow.parquet.write_table(table, os.path.join(path, f"{name}.parquet"))
+            else:
+                pyarrow.feather.write_feather(table, os.path.join(path, f"{name}.arrow"))
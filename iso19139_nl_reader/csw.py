@@ -0,0 +1,46 @@
+import os
+from pathlib import Path
+import lxml.etree as et
+from .metadata_record import MetadataRecord
+from .xpath import NAMESPACES
+
+MD_METADATA_TAG = f"{{{NAMESPACES['gmd']}}}MD_Metadata"
+
+
+def collect_responses(paths):
+    # a directory holds paged GetRecords responses, read in file name order
+    responses = []
+    for path in paths:
+        if os.path.isdir(path):
+            responses.extend(str(response) for response in sorted(Path(path).glob("*.xml")))
+        else:
+            responses.append(path)
+    return responses
+
+
+def iter_csw_records(source):
+    # source is a path or binary file object of a saved GetRecordsResponse,
+    # records are yielded one by one and the parsed elements are cleared
+    # right away, so memory use does not grow with the size of the response
+    context = et.iterparse(source, events=("end",), tag=MD_METADATA_TAG, huge_tree=True)
+    for _, element in context:
+        record = MetadataRecord.from_element(element)
+        element.clear()
+        parent = element.getparent()
+        if parent is not None:
+            while element.getprevious() is not None:
+                del parent[0]
+        yield record
+    del context
+
+
+def iter_csw_responses(paths):
+    # yields (response, record, None) per record and (response, None, error)
+    # for a response that cannot be read or parsed, the records before the
+    # error are yielded as usual and the next response is read
+    for response in collect_responses(paths):
+        try:
+            for record in iter_csw_records(response):
+                yield response, record, None
+        except Exception as err:
+            yield response, None, f"{type(err).__name__}: {err}"
@@ -0,0 +1,111 @@
+# field name -> (getter method of MetadataRecord, getter arguments)
+FIELD_GETTERS = {
+    "inspire": ("is_inspire", ()),
+    "inspire_theme_uri": ("get_inspire_theme_url", ()),
+    "ogc_service_type": ("get_ogc_servicetype", ()),
+    "service_capabilities_url": ("get_service_capabilities_url", ()),
+    "md_standardname": ("get_metadatastandardname", ()),
+    "md_standardversion": ("get_metadatastandardversion", ()),
+    "md_identifier": ("get_mdidentifier", ()),
+    "datestamp": ("get_datestamp", ()),
+    "title": ("get_title", ()),
+    "abstract": ("get_abstract", ()),
+    "md_dates": ("check_md_dates", ()),
+    "resource_identifier": ("get_resource_identifier", ()),
+    "resource_identifier_href": ("get_resource_identifier_href", ()),
+    "bbox": ("get_bbox", ()),
+    "keywords": ("get_keywords", ()),
+    "uselimitations": ("get_uselimitations", ()),
+    "license": ("get_license", ()),
+    "thumbnails": ("get_thumbnails", ()),
+    "metadata_contact": ("get_metadata_contact", ()),
+    "resource_contact": ("get_resource_contact", ()),
+    "publication_date": ("get_md_date", ("publication",)),
+    "revision_date": ("get_md_date", ("revision",)),
+    "creation_date": ("get_md_date", ("creation",)),
+    "service_type": ("get_servicetype", ()),
+    "linked_datasets": ("get_operateson", ()),
+}
+
+# conditions for optional output keys
+ALWAYS = None
+IF_INSPIRE = "if_inspire"
+IF_SET = "if_set"
+
+# output specs: (output key, field name, condition), in output order; an
+# output key of None means the field is only evaluated (a check that raises)
+SERVICE_FIELDS = (
+    ("inspire", "inspire", ALWAYS),
+    ("inspire_theme_uri", "inspire_theme_uri", IF_INSPIRE),
+    ("ogc_service_type", "ogc_service_type", ALWAYS),
+    ("service_capabilities_url", "service_capabilities_url", ALWAYS),
+    ("md_standardname", "md_standardname", ALWAYS),
+    ("md_standardversion", "md_standardversion", ALWAYS),
+    ("md_identifier", "md_identifier", ALWAYS),
+    ("datestamp", "datestamp", ALWAYS),
+    ("service_title", "title", ALWAYS),
+    ("service_abstract", "abstract", ALWAYS),
+    (None, "md_dates", ALWAYS),
+    ("metadata_identifier", "md_identifier", ALWAYS),
+    ("resource_identifier", "resource_identifier", ALWAYS),
+    ("resource_identifier_href", "resource_identifier_href", ALWAYS),
+    ("title", "title", ALWAYS),
+    ("abstract", "abstract", ALWAYS),
+    ("bbox", "bbox", ALWAYS),
+    ("keywords", "keywords", ALWAYS),
+    ("uselimitations", "uselimitations", ALWAYS),
+    ("license", "license", ALWAYS),
+    ("thumbnails", "thumbnails", ALWAYS),
+    ("metadata_contact", "metadata_contact", ALWAYS),
+    ("resource_contact", "resource_contact", ALWAYS),
+    ("publication_date", "publication_date", IF_SET),
+    ("revision_date", "revision_date", IF_SET),
+    ("creation_date", "creation_date", IF_SET),
+    ("service_type", "service_type", ALWAYS),
+    ("linked_datasets", "linked_datasets", ALWAYS),
+)
+
+DATASET_FIELDS = (
+    (None, "md_dates", ALWAYS),
+    ("metadata_identifier", "md_identifier", ALWAYS),
+    ("resource_identifier", "resource_identifier", ALWAYS),
+    ("resource_identifier_href", "resource_identifier_href", ALWAYS),
+    ("title", "title", ALWAYS),
+    ("abstract", "abstract", ALWAYS),
+    ("bbox", "bbox", ALWAYS),
+    ("keywords", "keywords", ALWAYS),
+    ("uselimitations", "uselimitations", ALWAYS),
+    ("license", "license", ALWAYS),
+    ("thumbnails", "thumbnails", ALWAYS),
+    ("metadata_contact", "metadata_contact", ALWAYS),
+    ("resource_contact", "resource_contact", ALWAYS),
+    ("publication_date", "publication_date", IF_SET),
+    ("revision_date", "revision_date", IF_SET),
+    ("creation_date", "creation_date", IF_SET),
+    ("datestamp", "datestamp", ALWAYS),
+    ("ogc_service_type", "ogc_service_type", ALWAYS),
+    ("service_capabilities_url", "service_capabilities_url", ALWAYS),
+    ("metadata_standardname", "md_standardname", ALWAYS),
+    ("metadata_standardversion", "md_standardversion", ALWAYS),
+    ("inspire", "inspire", ALWAYS),
+    ("inspire_theme_uri", "inspire_theme_uri", IF_INSPIRE),
+)
+
+RECORD_FIELDS = {
+    "service": SERVICE_FIELDS,
+    "dataset": DATASET_FIELDS,
+}
+
+
+def build_dictionary(record, field_specs):
+    result = {}
+    for key, name, condition in field_specs:
+        if condition == IF_INSPIRE and not record.get_field("inspire"):
+            continue
+        value = record.get_field(name)
+        if key is None:
+            continue
+        if condition == IF_SET and not value:
+            continue
+        result[key] = value
+    return result
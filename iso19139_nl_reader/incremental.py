@@ -0,0 +1,75 @@
+import hashlib
+import json
+import os
+
+ADDED = "added"
+CHANGED = "changed"
+DELETED = "deleted"
+FAILED = "failed"
+COMPARE_MODES = ("datestamp", "hash")
+
+
+def content_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as md_file:
+        for chunk in iter(lambda: md_file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class HarvestIndex():
+    # fileIdentifier -> [dateStamp, content hash, path] of the previous run,
+    # stored as compact JSON; records without fileIdentifier are keyed by path
+    def __init__(self, entries=None):
+        self.entries = entries if entries is not None else {}
+
+    @classmethod
+    def load(cls, path):
+        if not os.path.exists(path):
+            return cls()
+        with open(path, "r", encoding="utf-8") as index_file:
+            return cls(json.load(index_file))
+
+    def save(self, path):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as index_file:
+            json.dump(self.entries, index_file, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+
+def record_key(file_identifier, path):
+    if file_identifier is None:
+        return f"file:{path}"
+    return file_identifier
+
+
+def diff_harvest(sources, index, compare="datestamp"):
+    # yields (change, key, path, entry) for added and changed records and
+    # (DELETED, key, None, None) for records missing from this harvest and
+    # (FAILED, None, path, error) for sources that could not be read, the
+    # entries indexed for such a path are kept and not reported as deleted;
+    # with compare="hash" the full content is hashed as well, which also
+    # catches edits that did not update the dateStamp
+    if compare not in COMPARE_MODES:
+        raise ValueError(f"unknown compare mode: {compare}")
+    from .sniff import sniff_identity
+    seen = set()
+    failed = set()
+    for path in sources:
+        try:
+            file_identifier, datestamp = sniff_identity(path)
+            entry = [datestamp, content_hash(path) if compare == "hash" else None, path]
+        except Exception as err:
+            failed.add(path)
+            yield FAILED, None, path, f"{type(err).__name__}: {err}"
+            continue
+        key = record_key(file_identifier, path)
+        seen.add(key)
+        previous = index.entries.get(key)
+        if previous is None:
+            yield ADDED, key, path, entry
+        elif previous[0] != entry[0] or (compare == "hash" and previous[1] != entry[1]):
+            yield CHANGED, key, path, entry
+    for key, entry in index.entries.items():
+        if key not in seen and (len(entry) < 3 or entry[2] not in failed):
+            yield DELETED, key, None, None
@@ -0,0 +1,53 @@
+ERROR = "error"
+WARNING = "warning"
+
+# categories of conversion issues
+UNKNOWN_PROTOCOL = "unknown_protocol"
+INVALID_URL = "invalid_url"
+LICENSE = "license"
+MISSING_DATE = "missing_date"
+OPERATESON = "operateson"
+RECORD_TYPE = "record_type"
+UNEXPECTED = "unexpected"
+
+
+class ConversionIssue():
+    __slots__ = ("severity", "category", "field", "message")
+
+    def __init__(self, severity, category, field, message):
+        self.severity = severity
+        self.category = category
+        self.field = field
+        self.message = message
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.severity}, {self.category}, {self.field}: {self.message})"
+
+
+class IssueCounts():
+    # issue counts per severity and category over a batch of records, from
+    # the issue dicts in the batch results
+    def __init__(self):
+        self.counts = {}
+        self.records_with_errors = 0
+
+    def add(self, issues):
+        has_error = False
+        for issue in issues:
+            categories = self.counts.setdefault(issue["severity"], {})
+            categories[issue["category"]] = categories.get(issue["category"], 0) + 1
+            has_error = has_error or issue["severity"] == ERROR
+        if has_error:
+            self.records_with_errors += 1
+
+    def total(self, severity):
+        return sum(self.counts.get(severity, {}).values())
+
+    def to_dict(self):
+        result = {"records_with_errors": self.records_with_errors}
+        for severity in (ERROR, WARNING):
+            result[severity] = dict(sorted(self.counts.get(severity, {}).items()))
+        return result
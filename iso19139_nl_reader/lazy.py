@@ -0,0 +1,57 @@
+import io
+from .fields import FIELD_GETTERS
+from .metadata_record import MetadataRecord
+from .sniff import SNIFF_FIELDS, sniff
+
+
+class LazyRecord():
+    # a view on a metadata document (path, bytes or seekable binary file): the sniffed fields
+    # (hierarchy_level, file_identifier, datestamp, protocol) only parse the
+    # start of the document, the document is parsed in full on first access
+    # to any other field, fields are then computed on first access and cached
+    # by MetadataRecord.get_field
+    __slots__ = ("source", "_summary", "_record")
+
+    def __init__(self, source):
+        self.source = source
+        self._summary = None
+        self._record = None
+
+    @property
+    def summary(self):
+        if self._summary is None:
+            self._summary = sniff(self.source)
+        return self._summary
+
+    @property
+    def record(self):
+        if self._record is None:
+            if isinstance(self.source, (bytes, bytearray, memoryview)):
+                self._record = MetadataRecord.from_bytes(bytes(self.source))
+            elif isinstance(self.source, io.IOBase):
+                # a binary file object, sniffing may have read part of it
+                self.source.seek(0)
+                self._record = MetadataRecord.from_file(self.source)
+            else:
+                self._record = MetadataRecord.from_path(self.source)
+        return self._record
+
+    @property
+    def parsed(self):
+        return self._record is not None
+
+    def __getattr__(self, name):
+        if name in SNIFF_FIELDS:
+            return getattr(self.summary, name)
+        if name in FIELD_GETTERS:
+            return self.record.get_field(name)
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    def get_field(self, name):
+        return self.record.get_field(name)
+
+    def convert_to_dictionary(self):
+        return self.record.convert_to_dictionary()
+
+    def convert_to_record(self):
+        return self.record.convert_to_record()
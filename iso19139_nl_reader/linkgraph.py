@@ -0,0 +1,136 @@
+import json
+import os
+from .model import to_str
+
+# service <-> dataset coupling from srv:operatesOn: a service links to the
+# metadata identifier of a dataset record (id in @xlink:href) and to its
+# resource identifier (@uuidref); identifiers are compared lower case, as
+# get_operateson lower cases the @xlink:href
+
+
+def normalize_id(value):
+    value = to_str(value)
+    if value is None:
+        return None
+    return value.strip().lower() or None
+
+
+class LinkGraph():
+    # services: service id -> [[dataset md id, dataset source id], ...]
+    # datasets: dataset md id -> resource identifier
+    # the services per dataset are derived and kept up to date on changes
+    def __init__(self, services=None, datasets=None):
+        self.services = services if services is not None else {}
+        self.datasets = datasets if datasets is not None else {}
+        self._services_per_dataset = {}
+        for service_id, links in self.services.items():
+            self._link(service_id, links)
+
+    def _link(self, service_id, links):
+        for dataset_id, _ in links:
+            if dataset_id is not None:
+                self._services_per_dataset.setdefault(dataset_id, set()).add(service_id)
+
+    def _unlink(self, service_id):
+        for dataset_id, _ in self.services.get(service_id, ()):
+            services = self._services_per_dataset.get(dataset_id)
+            if services is not None:
+                services.discard(service_id)
+                if not services:
+                    del self._services_per_dataset[dataset_id]
+
+    def set_service(self, service_id, links):
+        # links: (dataset md id, dataset source id) pairs, replaces earlier links
+        service_id = normalize_id(service_id)
+        self._unlink(service_id)
+        links = [[normalize_id(dataset_id), normalize_id(source_id)] for dataset_id, source_id in links]
+        self.services[service_id] = links
+        self._link(service_id, links)
+
+    def set_dataset(self, dataset_id, resource_identifier):
+        self.datasets[normalize_id(dataset_id)] = normalize_id(resource_identifier)
+
+    def remove(self, md_id):
+        md_id = normalize_id(md_id)
+        self._unlink(md_id)
+        self.services.pop(md_id, None)
+        self.datasets.pop(md_id, None)
+
+    def add_record(self, record):
+        # returns False for records that are neither service nor dataset, and
+        # for records without fileIdentifier, which cannot be linked to
+        if record.record_type not in ("service", "dataset") or normalize_id(record.metadata_id) is None:
+            return False
+        # a record changing type should not be left behind as the other
+        self.remove(record.metadata_id)
+        if record.record_type == "service":
+            links = record.get_field("linked_datasets") or []
+            self.set_service(record.metadata_id, [
+                (link["dataset_md_identifier"], link["dataset_source_identifier"]) for link in links])
+        else:
+            self.set_dataset(record.metadata_id, record.get_field("resource_identifier"))
+        return True
+
+    def services_for_dataset(self, dataset_id):
+        return sorted(self._services_per_dataset.get(normalize_id(dataset_id), ()))
+
+    def datasets_for_service(self, service_id):
+        return [dataset_id for dataset_id, _ in self.services.get(normalize_id(service_id), ())]
+
+    def dangling(self):
+        # links to dataset records that are not in the catalogue, or without
+        # a dataset metadata identifier at all
+        for service_id, links in self.services.items():
+            for dataset_id, source_id in links:
+                if dataset_id is None or dataset_id not in self.datasets:
+                    yield {"service": service_id, "dataset_md_identifier": dataset_id,
+                           "dataset_source_identifier": source_id}
+
+    def mismatched(self):
+        # links whose @uuidref is not the resource identifier of the dataset
+        # record the @xlink:href points to
+        for service_id, links in self.services.items():
+            for dataset_id, source_id in links:
+                if dataset_id in self.datasets and self.datasets[dataset_id] != source_id:
+                    yield {"service": service_id, "dataset_md_identifier": dataset_id,
+                           "dataset_source_identifier": source_id,
+                           "resource_identifier": self.datasets[dataset_id]}
+
+    def stats(self):
+        return {
+            "services": len(self.services),
+            "datasets": len(self.datasets),
+            "links": sum(len(links) for links in self.services.values()),
+            "linked_datasets": len(self._services_per_dataset),
+        }
+
+    def report(self):
+        return {**self.stats(), "dangling": list(self.dangling()), "mismatched": list(self.mismatched())}
+
+    @classmethod
+    def load(cls, path):
+        if not os.path.exists(path):
+            return cls()
+        with open(path, "r", encoding="utf-8") as graph_file:
+            data = json.load(graph_file)
+        return cls(data["services"], data["datasets"])
+
+    def save(self, path):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as graph_file:
+            json.dump({"services": self.services, "datasets": self.datasets}, graph_file, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+
+def build_link_graph(records, graph=None):
+    # one pass over MetadataRecords, conversion errors in the linked fields
+    # are collected instead of raised; returns the graph and the number of
+    # records that could not be added
+    graph = graph if graph is not None else LinkGraph()
+    skipped = 0
+    for record in records:
+        with record.non_strict():
+            added = graph.add_record(record)
+        if not added:
+            skipped += 1
+    return graph, skipped
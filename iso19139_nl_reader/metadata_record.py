@@ -1,34 +1,35 @@
-import os.path
+import copy
+import mmap
+from contextlib import contextmanager
 from urllib.parse import parse_qs, urlparse
-import pkg_resources
 import lxml.etree as et
-from .util import is_url
+from .fields import DATASET_FIELDS, FIELD_GETTERS, SERVICE_FIELDS, build_dictionary
+from .issues import (ERROR, INVALID_URL, LICENSE, MISSING_DATE, OPERATESON, RECORD_TYPE, UNEXPECTED, UNKNOWN_PROTOCOL,
+                     WARNING, ConversionIssue)
+from .model import RECORD_MODELS
+from .profiling import profiler
+from .schema_registry import DEFAULT_PROFILE, schema_registry
+from .util import is_url, scope_code_value
+from .validation import DEFAULT_MAX_ERRORS, collect_errors, format_errors
+from .xpath import NAMESPACES, XPATH_METADATA, XPATH_RECORD_TYPE, XPATH_RESOURCE_IDENTIFICATION, get_xpath
 
 class WarningError(Exception):
+    # warnings are reported as ConversionIssue, see report_warning
     pass
 
 class MetadataRecord():
-    def __init__(self, md_file):
-        xml_string = md_file.read().encode("utf-8")
-        xpath_metadata = "/gmd:MD_Metadata"
-
-        self.xml_string = xml_string
-        self.etree = et.fromstring(xml_string)
-        self.xpath_metadata = xpath_metadata
-        self.xpath_record_type = f"{xpath_metadata}/gmd:hierarchyLevel/gmd:MD_ScopeCode"
-
-        self.namespaces = {
-            "csw": "http://www.opengis.net/cat/csw/2.0.2",
-            "gco": "http://www.isotc211.org/2005/gco",
-            "geonet": "http://www.fao.org/geonetwork",
-            "gmd": "http://www.isotc211.org/2005/gmd",
-            "gml": "http://www.opengis.net/gml",
-            "gmx": "http://www.isotc211.org/2005/gmx",
-            "gsr": "http://www.isotc211.org/2005/gsr",
-            "gts": "http://www.isotc211.org/2005/gts",
-            "srv": "http://www.isotc211.org/2005/srv",
-            "xlink": "http://www.w3.org/1999/xlink",
-        }
+    def __init__(self, md_file=None, etree=None, xml_string=None, keep_bytes=False):
+        if etree is None:
+            xml_string = md_file.read().encode("utf-8")
+            etree = profiler.call("parse", et.fromstring, xml_string)
+        # raw bytes are only held on to when asked for, the parsed tree is
+        # used for conversion and validation
+        self.xml_string = xml_string if keep_bytes else None
+        self.etree = etree
+        self.xpath_metadata = XPATH_METADATA
+        self.xpath_record_type = XPATH_RECORD_TYPE
+
+        self.namespaces = NAMESPACES
         self.service_types = {
             "OGC:CSW": "CSW",
             "OGC:WMS": "WMS",
@@ -40,24 +41,103 @@ class MetadataRecord():
             "UKST": "TMS"
         }
         self.record_type = self.get_recordtype()
-        if self.record_type == "service":
-            self.xpath_resource_identification = f"{xpath_metadata}/gmd:identificationInfo/srv:SV_ServiceIdentification"
-        elif self.record_type == "dataset":
-            self.xpath_resource_identification = f"{xpath_metadata}/gmd:identificationInfo/gmd:MD_DataIdentification"
+        if self.record_type in XPATH_RESOURCE_IDENTIFICATION:
+            self.xpath_resource_identification = XPATH_RESOURCE_IDENTIFICATION[self.record_type]
         self.metadata_id = self.get_mdidentifier()
-
-    def get_single_xpath_value(self, xpath, etree=None):
+        self._fields = {}
+        # in strict mode (the default) the first error raises ValueError,
+        # otherwise errors are collected in issues and the field is None;
+        # warnings never raise
+        self.strict = True
+        self.issues = []
+
+    def get_field(self, name):
+        # fields are memoized per record, so output keys sharing a field and
+        # fields derived from other fields do not repeat the XPath lookups
+        if name in self._fields:
+            return self._fields[name]
+        getter, args = FIELD_GETTERS[name]
+        try:
+            if profiler.enabled:
+                value = profiler.call("field." + name, getattr(self, getter), *args)
+            else:
+                value = getattr(self, getter)(*args)
+        except Exception as err:
+            if self.strict:
+                raise
+            self.issues.append(ConversionIssue(ERROR, UNEXPECTED, name, f"{type(err).__name__}: {err}"))
+            value = None
+        self._fields[name] = value
+        return value
+
+    @contextmanager
+    def non_strict(self):
+        # collects errors in issues for the duration of the block and then
+        # restores the previous mode; fields memoized as None after an error
+        # are forgotten, so a strict caller sees the error again
+        strict, self.strict = self.strict, False
+        issue_count = len(self.issues)
+        try:
+            yield self.issues
+        finally:
+            self.strict = strict
+            if strict and len(self.issues) > issue_count:
+                self._fields = {}
+
+    def report_error(self, field, category, message):
+        if self.strict:
+            raise ValueError(message)
+        self.issues.append(ConversionIssue(ERROR, category, field, message))
+
+    def report_warning(self, field, category, message):
+        self.issues.append(ConversionIssue(WARNING, category, field, message))
+
+    @classmethod
+    def from_bytes(cls, data, keep_bytes=False):
+        return cls(etree=profiler.call("parse", et.fromstring, data), xml_string=data, keep_bytes=keep_bytes)
+
+    @classmethod
+    def from_file(cls, md_file, keep_bytes=False):
+        # md_file is a binary file object, lxml decodes using the encoding
+        # declared in the document
+        if keep_bytes:
+            return cls.from_bytes(md_file.read(), keep_bytes=True)
+        return cls(etree=profiler.call("parse", et.parse, md_file).getroot())
+
+    @classmethod
+    def from_path(cls, path, keep_bytes=False):
+        if keep_bytes:
+            with open(path, "rb") as md_file:
+                return cls.from_bytes(md_file.read(), keep_bytes=True)
+        return cls(etree=profiler.call("parse", et.parse, str(path)).getroot())
+
+    @classmethod
+    def from_mmap(cls, path):
+        # parse straight from a memory-mapped file, without reading the
+        # document into a bytes object first
+        with open(path, "rb") as md_file:
+            with mmap.mmap(md_file.fileno(), 0, access=mmap.ACCESS_READ) as md_map:
+                return cls(etree=profiler.call("parse", et.fromstring, md_map))
+
+    @classmethod
+    def from_element(cls, element):
+        # the copy becomes the root of its own document, so absolute XPaths
+        # work and the source element can be cleared by streaming readers
+        return cls(etree=copy.deepcopy(element))
+
+    def get_xpath_result(self, xpath, etree=None):
         if etree is None:
             etree = self.etree
-        result = etree.xpath(xpath, namespaces=self.namespaces)
+        return get_xpath(xpath)(etree)
+
+    def get_single_xpath_value(self, xpath, etree=None):
+        result = self.get_xpath_result(xpath, etree)
         if result:
             return result[0].text
         return None
 
     def get_single_xpath_att(self, xpath, etree=None):
-        if etree is None:
-            etree = self.etree
-        result = etree.xpath(xpath, namespaces=self.namespaces)
+        result = self.get_xpath_result(xpath, etree)
         if result:
             return result[0]
         return None
@@ -70,16 +150,20 @@ class MetadataRecord():
             xpath_prot = f"{xpath}/gmd:protocol/gmx:Anchor"
         protocol = self.get_single_xpath_value(xpath_prot)
         if not protocol in self.service_types:
-            raise ValueError(
+            self.report_error(
+                "ogc_service_type", UNKNOWN_PROTOCOL,
                 f"md_id: {self.metadata_id}, unknown protocol found in gmd:CI_OnlineResource {protocol}")
+            return None
         return self.service_types[protocol]
 
     def get_service_capabilities_url(self):
         xpath = f"{self.xpath_metadata}/gmd:distributionInfo/gmd:MD_Distribution/gmd:transferOptions/gmd:MD_DigitalTransferOptions/gmd:onLine/gmd:CI_OnlineResource/gmd:linkage/gmd:URL"
         url = self.get_single_xpath_value(xpath)
         if not is_url(url):
-            raise ValueError(
+            self.report_error(
+                "service_capabilities_url", INVALID_URL,
                 f"md_id: {self.metadata_id}, no valid url found for gmd:MD_Distribution/gmd:transferOptions/gmd:MD_DigitalTransferOptions/gmd:onLine/gmd:CI_OnlineResource: {url}")
+            return None
         return url
 
     def get_contact(self, base):
@@ -96,6 +180,14 @@ class MetadataRecord():
         result["role"] = self.get_single_xpath_att(xpath_role)
         return result
 
+    def get_metadata_contact(self):
+        return self.get_contact(
+            f"{self.xpath_metadata}/gmd:contact/gmd:CI_ResponsibleParty")
+
+    def get_resource_contact(self):
+        return self.get_contact(
+            f"{self.xpath_resource_identification}/gmd:pointOfContact/gmd:CI_ResponsibleParty")
+
     def get_mdidentifier(self):
         xpath = f"{self.xpath_metadata}/gmd:fileIdentifier/gco:CharacterString"
         return self.get_single_xpath_value(xpath)
@@ -124,6 +216,12 @@ class MetadataRecord():
         xpath = f"{self.xpath_resource_identification}/gmd:citation/gmd:CI_Citation/gmd:date/gmd:CI_Date/gmd:dateType/gmd:CI_DateTypeCode[@codeListValue='{date_type}']/../../gmd:date/gco:Date"
         return self.get_single_xpath_value(xpath)
 
+    def check_md_dates(self):
+        if not (self.get_field("publication_date") or self.get_field("revision_date") or self.get_field("creation_date")):
+            self.report_error(
+                "md_dates", MISSING_DATE,
+                f"md_id: {self.metadata_id}, at least one of publication, revision or creation date should be set")
+
     def get_abstract(self):
         xpath = f"{self.xpath_resource_identification}/gmd:abstract/gco:CharacterString"
         return self.get_single_xpath_value(xpath)
@@ -133,8 +231,8 @@ class MetadataRecord():
         return self.get_single_xpath_value(xpath)
 
     def get_keywords(self):
-        result = self.etree.xpath(
-            f'{self.xpath_resource_identification}/gmd:descriptiveKeywords/gmd:MD_Keywords/gmd:keyword/gco:CharacterString', namespaces=self.namespaces)
+        result = self.get_xpath_result(
+            f'{self.xpath_resource_identification}/gmd:descriptiveKeywords/gmd:MD_Keywords/gmd:keyword/gco:CharacterString')
         keywords = []
         for keyword in result:
             keywords.append(keyword.text)
@@ -159,18 +257,18 @@ class MetadataRecord():
 
         # first try nl profiel 2.0
         result = {}
-        xpath_result = self.etree.xpath(
-            xpath_20_href, namespaces=self.namespaces)
+        xpath_result = self.get_xpath_result(xpath_20_href)
         if xpath_result:
             result["url"] = xpath_result[0]
             result["description"] = self.get_single_xpath_value(xpath_20)
         else:
             # otherwise try nl profiel 1.2
-            xpath_result = self.etree.xpath(
-                xpath_12, namespaces=self.namespaces)
+            xpath_result = self.get_xpath_result(xpath_12)
             if len(xpath_result) <= 1:
-                raise ValueError(
+                self.report_error(
+                    "license", LICENSE,
                     f"md_id: {self.metadata_id}, unable to determine license from metadata, xpath: gmd:resourceConstraints/gmd:MD_LegalConstraints/gmd:otherConstraints/")
+                return None
             result["description"] = xpath_result[0].text
             result["url"] = xpath_result[1].text
         # validate license url
@@ -178,58 +276,47 @@ class MetadataRecord():
             result["url"], result["description"] = result["description"], result["url"]
             if not is_url(result["url"]):
                 url_val = result["url"]
-                raise ValueError(
+                self.report_error(
+                    "license", LICENSE,
                     f"md_id: {self.metadata_id}, could not determine license url in gmd:MD_LegalConstraints, found {url_val}")
+                return None
         return result
 
     def is_inspire(self):
         # record is considered inspire record if has inspire theme defined
-        xpath = f"{self.xpath_resource_identification}/gmd:descriptiveKeywords/gmd:MD_Keywords/gmd:thesaurusName/gmd:CI_Citation/\
-            gmd:title/gmx:Anchor[@xlink:href='http://www.eionet.europa.eu/gemet/inspire_themes']/../../../../gmd:keyword/gmx:Anchor/@xlink:href"
-        uri = self.get_single_xpath_att(xpath)
+        uri = self.get_field("inspire_theme_uri")
         if uri:
             return True
         else:
             return False
 
     def validate_xml_form(self):
+        # the document was parsed when the record was created, so a record
+        # only exists for well-formed XML and there is nothing to re-parse
         result = ""
-        try:
-            parser = et.XMLParser()
-            et.fromstring(self.xml_string, parser=parser)
-        except IOError:
+        if self.etree is None:
             result = "Invalid File"
-        # check for XML syntax errors
-        except et.XMLSyntaxError as err:
-            result = "XML Syntax Error: {0}".format(err.msg)
         return result
 
-    def schema_validation_errors(self):
-        result = self.validate_xml_form()
+    def schema_validation_errors(self, profile=DEFAULT_PROFILE, max_errors=DEFAULT_MAX_ERRORS):
+        result = profiler.call("validate.xml_form", self.validate_xml_form)
         if result:
             return result
-        schema_path = pkg_resources.resource_filename(__name__,
-                                                      "data/schema/schemas.opengis.net/csw/2.0.2/profiles/apiso/1.0.0/apiso.xsd")
-        with open(schema_path, 'rb') as xml_schema_file:
-            schema_doc = et.XML(xml_schema_file.read(), base_url=schema_path)
-            schema = et.XMLSchema(schema_doc)
-            parser = et.XMLParser(
-                ns_clean=True, recover=True, encoding='utf-8')
-            xml_string = et.XML(self.xml_string, parser=parser)
-            if not schema.validate(xml_string):
-                for error in schema.error_log:
-                    result += f"\n\terror: {error.message}, line: {error.line}, column {error.column}"
+        schema = profiler.call("validate.schema_load", schema_registry.get_schema, profile)
+        if not profiler.call("validate.schema_validate", schema.validate, self.etree):
+            errors, count = collect_errors(schema.error_log, max_errors)
+            result = format_errors(errors, count)
         return result
 
-    def is_valid(self):
-        if self.schema_validation_errors():
+    def is_valid(self, profile=DEFAULT_PROFILE):
+        if self.schema_validation_errors(profile):
             return False
         return True
 
     def get_thumbnails(self):
         result = []
         xpath = f"{self.xpath_resource_identification}/gmd:graphicOverview/gmd:MD_BrowseGraphic"
-        xpath_result = self.etree.xpath(xpath, namespaces=self.namespaces)
+        xpath_result = self.get_xpath_result(xpath)
         for graphic in xpath_result:
             xpath_file = f"gmd:fileName/gco:CharacterString"
             xpath_description = f"gmd:fileDescription/gco:CharacterString"
@@ -250,7 +337,10 @@ class MetadataRecord():
 
     def get_recordtype(self):
         xpath = f"{self.xpath_record_type}"
-        return self.get_single_xpath_value(xpath)
+        result = self.get_xpath_result(xpath)
+        if result:
+            return scope_code_value(result[0])
+        return None
 
     def get_bbox(self):
         if self.record_type == "service":
@@ -271,8 +361,7 @@ class MetadataRecord():
 
     def get_operateson(self):
         xpath_operateson = f"{self.xpath_resource_identification}/srv:operatesOn"
-        xpath_result = self.etree.xpath(
-            xpath_operateson, namespaces=self.namespaces)
+        xpath_result = self.get_xpath_result(xpath_operateson)
         result_list = []
         for operateson in xpath_result:
             result = {}
@@ -281,126 +370,54 @@ class MetadataRecord():
             dataset_source_identifier = self.get_single_xpath_att(
                 xpath_uuidref, operateson)
             dataset_md_url = self.get_single_xpath_att(xpath_href, operateson)
-            parsed = urlparse(dataset_md_url.lower())
-            dataset_md_identifier = parse_qs(parsed.query)['id'][0]
+            ids = parse_qs(urlparse(dataset_md_url.lower()).query).get("id") if dataset_md_url else None
+            dataset_md_identifier = ids[0] if ids else None
+            if dataset_md_identifier is None:
+                self.report_error(
+                    "linked_datasets", OPERATESON,
+                    f"md_id: {self.metadata_id}, no id parameter found in srv:operatesOn @xlink:href: {dataset_md_url}")
+            elif dataset_source_identifier == dataset_md_identifier:
+                self.report_warning(
+                    "linked_datasets", OPERATESON,
+                    f"md_id: {self.metadata_id}, invalid metadata content operateson @uuidref and id from @xlink:href are equal, value: {dataset_source_identifier}")
             result["dataset_md_identifier"] = dataset_md_identifier
             result["dataset_source_identifier"] = dataset_source_identifier
-            # TODO: raise WarningException and implement exception handling for this type of exception
-            # if dataset_source_identifier == dataset_md_identifier:
-            #     raise WarningError(
-            #         f"md_id: {self.metadata_id}, invalid metadata content operateson @uuidref and id\
-            #             from @xlink:href are equal, value: {dataset_source_identifier}")
             result_list.append(result)
         return result_list
 
     def get_service_dictionary(self):
-        result = {}
-        inspire = self.is_inspire()
-        result["inspire"] = inspire
-        if inspire:
-            result["inspire_theme_uri"] = self.get_inspire_theme_url()
-        ogc_service_type = self.get_ogc_servicetype()
-        result["ogc_service_type"] = ogc_service_type
-        result["service_capabilities_url"] = self.get_service_capabilities_url()
-        result["md_standardname"] = self.get_metadatastandardname()
-        result["md_standardversion"] = self.get_metadatastandardversion()
-        result["md_identifier"] = self.get_mdidentifier()
-        result["datestamp"] = self.get_datestamp()
-        result["service_title"] = self.get_title()
-        result["service_abstract"] = self.get_abstract()
-        pub_date = self.get_md_date("publication")
-        rev_date = self.get_md_date("revision")
-        create_date = self.get_md_date("creation")
-        if not (pub_date or rev_date or create_date):
-            raise ValueError(
-                f"md_id: {self.metadata_id}, at least one of publication, revision or creation date should be set")
-
-        result["metadata_identifier"] = self.get_mdidentifier()
-        result["resource_identifier"] = self.get_resource_identifier()
-        result["resource_identifier_href"] = self.get_resource_identifier_href()
-        result["title"] = self.get_title()
-        result["abstract"] = self.get_abstract()
-        result["bbox"] = self.get_bbox()
-        result["keywords"] = self.get_keywords()
-        result["uselimitations"] = self.get_uselimitations()
-        result["license"] = self.get_license()
-        result["thumbnails"] = self.get_thumbnails()
-
-        result["metadata_contact"] = self.get_contact(
-            f"{self.xpath_metadata}/gmd:contact/gmd:CI_ResponsibleParty")
-        result["resource_contact"] = self.get_contact(
-            f"{self.xpath_resource_identification}/gmd:pointOfContact/gmd:CI_ResponsibleParty")
-
-        if pub_date:
-            result["publication_date"] = pub_date
-        if rev_date:
-            result["revision_date"] = rev_date
-        if create_date:
-            result["creation_date"] = create_date
-        result["datestamp"] = self.get_datestamp()
-
-        result["service_type"] = self.get_servicetype()
-        result["ogc_service_type"] = self.get_ogc_servicetype()
-        result["service_capabilities_url"] = self.get_service_capabilities_url()
-        result["linked_datasets"] = self.get_operateson()
-
-        result["inspire"] = self.is_inspire()
-        if result["inspire"]:
-            result["inspire_theme_uri"] = self.get_inspire_theme_url()
-
-        result["md_standardname"] = self.get_metadatastandardname()
-        result["md_standardversion"] = self.get_metadatastandardversion()
-
-        return result
+        return build_dictionary(self, SERVICE_FIELDS)
 
     def get_dataset_dictionary(self):
-        result = {}
-        pub_date = self.get_md_date("publication")
-        rev_date = self.get_md_date("revision")
-        create_date = self.get_md_date("creation")
-        if not (pub_date or rev_date or create_date):
-            raise ValueError(
-                f"md_id: {self.metadata_id}, at least one of publication, revision or creation date should be set")
-
-        result["metadata_identifier"] = self.get_mdidentifier()
-        result["resource_identifier"] = self.get_resource_identifier()
-        result["resource_identifier_href"] = self.get_resource_identifier_href()
-
-        result["title"] = self.get_title()
-        result["abstract"] = self.get_abstract()
-        result["bbox"] = self.get_bbox()
-        result["keywords"] = self.get_keywords()
-        result["uselimitations"] = self.get_uselimitations()
-        result["license"] = self.get_license()
-        result["thumbnails"] = self.get_thumbnails()
-
-        result["metadata_contact"] = self.get_contact(
-            f"{self.xpath_metadata}/gmd:contact/gmd:CI_ResponsibleParty")
-        result["resource_contact"] = self.get_contact(
-            f"{self.xpath_resource_identification}/gmd:pointOfContact/gmd:CI_ResponsibleParty")
-
-        if pub_date:
-            result["publication_date"] = pub_date
-        if rev_date:
-            result["revision_date"] = rev_date
-        if create_date:
-            result["creation_date"] = create_date
-        result["datestamp"] = self.get_datestamp()
-
-        result["ogc_service_type"] = self.get_ogc_servicetype()
-        result["service_capabilities_url"] = self.get_service_capabilities_url()
-
-        result["metadata_standardname"] = self.get_metadatastandardname()
-        result["metadata_standardversion"] = self.get_metadatastandardversion()
-
-        result["inspire"] = self.is_inspire()
-        if result["inspire"]:
-            result["inspire_theme_uri"] = self.get_inspire_theme_url()
-
-        return result
+        return build_dictionary(self, DATASET_FIELDS)
 
     def convert_to_dictionary(self):
         if self.record_type == "service":
-            return self.get_service_dictionary()
+            return profiler.call("convert", self.get_service_dictionary)
         elif self.record_type == "dataset":
-            return self.get_dataset_dictionary()
+            return profiler.call("convert", self.get_dataset_dictionary)
+        if not self.strict:
+            self.report_error(
+                "record_type", RECORD_TYPE,
+                f"md_id: {self.metadata_id}, unsupported gmd:hierarchyLevel {self.record_type}")
+
+    def convert_with_issues(self):
+        # non-fatal conversion, returns the (partial) result and the errors
+        # and warnings found on the way
+        self._fields = {}
+        self.issues = []
+        with self.non_strict():
+            return self.convert_to_dictionary(), self.issues
+
+    def convert_to_record(self):
+        if self.record_type in RECORD_MODELS:
+            return RECORD_MODELS[self.record_type].from_metadata_record(self)
+        return None
+
+
+def convert_record(record, collect_issues=False):
+    # the result of read, with the issues when collecting them
+    if not collect_issues:
+        return {"result": record.convert_to_dictionary()}
+    result, issues = record.convert_with_issues()
+    return {"result": result, "issues": [issue.to_dict() for issue in issues]}
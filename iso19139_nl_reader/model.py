@@ -0,0 +1,199 @@
+import sys
+from .fields import DATASET_FIELDS, IF_INSPIRE, IF_SET, SERVICE_FIELDS
+
+
+def to_str(value):
+    # lxml attribute results are str subclasses that keep a reference to
+    # their element, and with it the whole parsed document
+    if value is None:
+        return None
+    return str(value)
+
+
+def intern_str(value):
+    # for values repeated across a catalogue: roles, protocols, license urls
+    if value is None:
+        return None
+    return sys.intern(str(value))
+
+
+def to_float(value, missing=None):
+    # missing is returned for absent and unparsable values, e.g. NaN for
+    # float arrays
+    if value is None:
+        return missing
+    try:
+        return float(value)
+    except ValueError:
+        return missing
+
+
+class Model():
+    __slots__ = ()
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __eq__(self, other):
+        if type(self) is not type(other):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({values})"
+
+    @classmethod
+    def from_dict(cls, value):
+        # getters return None for missing parts, which non-strict
+        # conversion keeps
+        if value is None:
+            return None
+        return cls(**value)
+
+
+class Contact(Model):
+    __slots__ = ("organisationname", "email", "url", "role")
+
+    def __init__(self, organisationname=None, email=None, url=None, role=None):
+        self.organisationname = intern_str(organisationname)
+        self.email = intern_str(email)
+        self.url = intern_str(url)
+        self.role = intern_str(role)
+
+
+class BBox(Model):
+    __slots__ = ("minx", "maxx", "maxy", "miny")
+
+    def __init__(self, minx=None, maxx=None, maxy=None, miny=None):
+        self.minx = to_float(minx)
+        self.maxx = to_float(maxx)
+        self.maxy = to_float(maxy)
+        self.miny = to_float(miny)
+
+
+class License(Model):
+    __slots__ = ("url", "description")
+
+    def __init__(self, url=None, description=None):
+        self.url = intern_str(url)
+        self.description = intern_str(description)
+
+
+class Thumbnail(Model):
+    __slots__ = ("file", "description", "filetype")
+
+    def __init__(self, file=None, description=None, filetype=None):
+        self.file = to_str(file)
+        self.description = to_str(description)
+        self.filetype = intern_str(filetype)
+
+
+class LinkedDataset(Model):
+    __slots__ = ("dataset_md_identifier", "dataset_source_identifier")
+
+    def __init__(self, dataset_md_identifier=None, dataset_source_identifier=None):
+        self.dataset_md_identifier = to_str(dataset_md_identifier)
+        self.dataset_source_identifier = to_str(dataset_source_identifier)
+
+
+def model_list(model_class):
+    def convert(values):
+        if values is None:
+            return None
+        return [model_class.from_dict(value) for value in values]
+    return convert
+
+
+def str_list(values):
+    if values is None:
+        return None
+    return [to_str(value) for value in values]
+
+
+# field name -> converter from the getter result to the model value,
+# fields not listed are plain strings
+FIELD_CONVERTERS = {
+    "inspire": bool,
+    "inspire_theme_uri": intern_str,
+    "ogc_service_type": intern_str,
+    "service_type": intern_str,
+    "md_standardname": intern_str,
+    "md_standardversion": intern_str,
+    "bbox": BBox.from_dict,
+    "keywords": str_list,
+    "license": License.from_dict,
+    "thumbnails": model_list(Thumbnail),
+    "metadata_contact": Contact.from_dict,
+    "resource_contact": Contact.from_dict,
+    "linked_datasets": model_list(LinkedDataset),
+}
+
+
+def field_names(field_specs):
+    names = []
+    for key, name, _ in field_specs:
+        if key is not None and name not in names:
+            names.append(name)
+    return tuple(names)
+
+
+def value_to_dict(value):
+    if isinstance(value, Model):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [value_to_dict(item) for item in value]
+    return value
+
+
+class Record(Model):
+    __slots__ = ()
+    field_specs = ()
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            setattr(self, name, values.get(name))
+
+    @classmethod
+    def from_metadata_record(cls, md_record):
+        # fields are taken in spec order, so checks raise as they do for
+        # convert_to_dictionary
+        values = {}
+        for _, name, condition in cls.field_specs:
+            if condition == IF_INSPIRE and not md_record.get_field("inspire"):
+                continue
+            value = md_record.get_field(name)
+            if name in cls.__slots__:
+                values[name] = FIELD_CONVERTERS.get(name, to_str)(value)
+        return cls(**values)
+
+    def to_dict(self):
+        # same layout as convert_to_dictionary, except that bbox coordinates
+        # are floats
+        result = {}
+        for key, name, condition in self.field_specs:
+            if key is None:
+                continue
+            if condition == IF_INSPIRE and not self.inspire:
+                continue
+            value = getattr(self, name)
+            if condition == IF_SET and not value:
+                continue
+            result[key] = value_to_dict(value)
+        return result
+
+
+class ServiceRecord(Record):
+    __slots__ = field_names(SERVICE_FIELDS)
+    field_specs = SERVICE_FIELDS
+
+
+class DatasetRecord(Record):
+    __slots__ = field_names(DATASET_FIELDS)
+    field_specs = DATASET_FIELDS
+
+
+RECORD_MODELS = {
+    "service": ServiceRecord,
+    "dataset": DatasetRecord,
+}
@@ -0,0 +1,120 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from .metadata_record import MetadataRecord
+from .serialize import JsonWriter
+
+
+def read_source(source):
+    with open(source, "rb") as md_file:
+        return md_file.read()
+
+
+def error_result(source, err):
+    return {"file": str(source), "error": f"{type(err).__name__}: {err}"}
+
+
+def convert_document(source, data):
+    # runs in the executor, module level so it can be sent to worker processes
+    try:
+        return {"file": str(source), "result": MetadataRecord.from_bytes(data).convert_to_dictionary()}
+    except Exception as err:
+        return error_result(source, err)
+
+
+async def convert_many(sources, concurrency=4, ordered=True, executor=None, io_concurrency=4, max_pending=None):
+    # files are read in a thread pool while documents are converted in the
+    # executor (a process pool with concurrency workers by default); at most
+    # max_pending documents are in flight between reading and yielding, so a
+    # slow consumer holds back reading; with ordered=False results are
+    # yielded as soon as they are ready
+    loop = asyncio.get_running_loop()
+    max_pending = max_pending or concurrency * 4
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(concurrency)
+    io_executor = ThreadPoolExecutor(io_concurrency)
+    pending = asyncio.Semaphore(max_pending)
+    source_queue = asyncio.Queue(max_pending)
+    data_queue = asyncio.Queue(max_pending)
+    result_queue = asyncio.Queue()
+
+    async def feed():
+        count = 0
+        for index, source in enumerate(sources):
+            await pending.acquire()
+            await source_queue.put((index, source))
+            count += 1
+        return count
+
+    # every index fed must get a result, or the consumer waits forever, so
+    # any failure of a source (bad source, broken executor) is its result
+    async def read():
+        while True:
+            index, source = await source_queue.get()
+            try:
+                data = await loop.run_in_executor(io_executor, read_source, source)
+            except Exception as err:
+                await result_queue.put((index, error_result(source, err)))
+            else:
+                await data_queue.put((index, source, data))
+
+    async def convert():
+        while True:
+            index, source, data = await data_queue.get()
+            try:
+                result = await loop.run_in_executor(executor, convert_document, source, data)
+            except Exception as err:
+                result = error_result(source, err)
+            await result_queue.put((index, result))
+
+    feeder = loop.create_task(feed())
+    tasks = [feeder]
+    tasks.extend(loop.create_task(read()) for _ in range(io_concurrency))
+    tasks.extend(loop.create_task(convert()) for _ in range(concurrency))
+    try:
+        done = 0
+        next_index = 0
+        buffered = {}
+        # until all sources are fed the number of results is unknown, so
+        # wait for a result or for the feeder to finish, whichever is first
+        while not feeder.done() or done < feeder.result():
+            if feeder.done():
+                index, result = await result_queue.get()
+            else:
+                get_result = loop.create_task(result_queue.get())
+                await asyncio.wait([get_result, feeder], return_when=asyncio.FIRST_COMPLETED)
+                if not get_result.done():
+                    get_result.cancel()
+                    continue
+                index, result = get_result.result()
+            if not ordered:
+                done += 1
+                pending.release()
+                yield result
+                continue
+            buffered[index] = result
+            while next_index in buffered:
+                done += 1
+                pending.release()
+                yield buffered.pop(next_index)
+                next_index += 1
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        io_executor.shutdown(wait=False)
+        if own_executor:
+            executor.shutdown(wait=True)
+
+
+async def write_many(results, stream, output_format="jsonl", json_backend="auto"):
+    # writes run in a thread, so conversion carries on while output is written
+    loop = asyncio.get_running_loop()
+    writer = JsonWriter(stream, output_format, json_backend)
+    count = 0
+    with ThreadPoolExecutor(1) as write_executor:
+        async for result in results:
+            await loop.run_in_executor(write_executor, writer.write, result)
+            count += 1
+        await loop.run_in_executor(write_executor, writer.flush)
+    return count
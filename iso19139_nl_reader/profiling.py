@@ -0,0 +1,93 @@
+import json
+import time
+
+PROFILE_FORMATS = ("text", "json", "prometheus")
+
+
+class Profiler():
+    # wall time and call counts per step; disabled by default, instrumented
+    # code only checks profiler.enabled before taking any timings
+    def __init__(self):
+        self.enabled = False
+        self.timings = {}
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        self.timings = {}
+
+    def record(self, name, elapsed):
+        timing = self.timings.get(name)
+        if timing is None:
+            self.timings[name] = [1, elapsed]
+        else:
+            timing[0] += 1
+            timing[1] += elapsed
+
+    def call(self, name, function, *args):
+        if not self.enabled:
+            return function(*args)
+        start = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def drain(self):
+        # timings so far, and start over; used to collect worker timings
+        timings = self.timings
+        self.timings = {}
+        return timings
+
+    def merge(self, timings):
+        for name, (count, elapsed) in timings.items():
+            timing = self.timings.setdefault(name, [0, 0.0])
+            timing[0] += count
+            timing[1] += elapsed
+
+    def report(self):
+        return {
+            name: {"calls": count, "seconds": elapsed, "mean_seconds": elapsed / count}
+            for name, (count, elapsed) in sorted(self.timings.items(), key=lambda item: -item[1][1])
+        }
+
+    def to_text(self):
+        lines = [f"{'step':40} {'calls':>8} {'total (s)':>10} {'mean (ms)':>10}"]
+        for name, timing in self.report().items():
+            lines.append(
+                f"{name:40} {timing['calls']:8d} {timing['seconds']:10.3f} {timing['mean_seconds'] * 1000:10.3f}")
+        return "\n".join(lines)
+
+    def to_json(self):
+        return json.dumps(self.report(), indent=4)
+
+    def to_prometheus(self):
+        lines = [
+            "# HELP iso19139_nl_reader_step_seconds_total Wall time spent per step.",
+            "# TYPE iso19139_nl_reader_step_seconds_total counter",
+        ]
+        lines.extend(
+            f'iso19139_nl_reader_step_seconds_total{{step="{name}"}} {elapsed}'
+            for name, (_, elapsed) in sorted(self.timings.items()))
+        lines.extend([
+            "# HELP iso19139_nl_reader_step_calls_total Number of calls per step.",
+            "# TYPE iso19139_nl_reader_step_calls_total counter",
+        ])
+        lines.extend(
+            f'iso19139_nl_reader_step_calls_total{{step="{name}"}} {count}'
+            for name, (count, _) in sorted(self.timings.items()))
+        return "\n".join(lines)
+
+    def format(self, profile_format="text"):
+        if profile_format == "json":
+            return self.to_json()
+        if profile_format == "prometheus":
+            return self.to_prometheus()
+        return self.to_text()
+
+
+profiler = Profiler()
@@ -0,0 +1,110 @@
+import os
+import threading
+import time
+
+SCHEMA_DIR = "data/schema"
+
+# NL profiel 1.2 and 2.0 records are validated against the apiso schema,
+# which is compiled once for all three; hits are counted per profile
+SCHEMA_PROFILES = {
+    "apiso": "schemas.opengis.net/csw/2.0.2/profiles/apiso/1.0.0/apiso.xsd",
+    "gmd": "standards.iso.org/ittf/PubliclyAvailableStandards/ISO_19139_Schemas/gmd/gmd.xsd",
+    "srv": "schemas.opengis.net/iso/19139/20070417/srv/1.0/srv.xsd",
+    "nl-1.2": "schemas.opengis.net/csw/2.0.2/profiles/apiso/1.0.0/apiso.xsd",
+    "nl-2.0": "schemas.opengis.net/csw/2.0.2/profiles/apiso/1.0.0/apiso.xsd",
+}
+DEFAULT_PROFILE = "apiso"
+
+
+_schema_dir = None
+
+
+def get_schema_dir():
+    # the package is installed unzipped (zip_safe=False), so the bundled
+    # schemas are a directory next to this module
+    global _schema_dir
+    if _schema_dir is None:
+        _schema_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), SCHEMA_DIR)
+    return _schema_dir
+
+
+def get_schema_path(profile):
+    if profile not in SCHEMA_PROFILES:
+        raise ValueError(f"unknown schema profile: {profile}")
+    return os.path.join(get_schema_dir(), SCHEMA_PROFILES[profile])
+
+
+def compile_schema(schema_path):
+    # imports and includes are resolved to the bundled schemas only, the
+    # network is never used; lxml is imported with the first schema
+    from . import schema_resolver
+    return schema_resolver.compile_schema(schema_path, get_schema_dir())
+
+
+class SchemaEntry():
+    # an XMLSchema keeps the error log of its last validation, so every
+    # thread gets its own compiled copy; compile_time is the total over all
+    # threads, hits are per profile
+    __slots__ = ("local", "compile_time", "compiles", "hits")
+
+    def __init__(self):
+        self.local = threading.local()
+        self.compile_time = 0.0
+        self.compiles = 0
+        self.hits = {}
+
+
+class SchemaRegistry():
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get_schema(self, profile=DEFAULT_PROFILE, schema_path=None):
+        # returns the schema compiled for the calling thread, so validate()
+        # and reading error_log afterwards are safe with several threads;
+        # profiles sharing a schema path share the compiled schema
+        if schema_path is None:
+            schema_path = get_schema_path(profile)
+        entry = self._entries.get(schema_path)
+        if entry is None:
+            with self._lock:
+                entry = self._entries.setdefault(schema_path, SchemaEntry())
+        schema = getattr(entry.local, "schema", None)
+        if schema is None:
+            start = time.perf_counter()
+            schema = entry.local.schema = compile_schema(schema_path)
+            with self._lock:
+                entry.compile_time += time.perf_counter() - start
+                entry.compiles += 1
+                entry.hits.setdefault(profile, 0)
+            return schema
+        with self._lock:
+            entry.hits[profile] = entry.hits.get(profile, 0) + 1
+        return schema
+
+    def warm_up(self, profiles=None):
+        # compiles the schemas for the calling thread
+        if profiles is None:
+            profiles = SCHEMA_PROFILES.keys()
+        for profile in profiles:
+            self.get_schema(profile)
+
+    def clear(self):
+        with self._lock:
+            self._entries = {}
+
+    def stats(self):
+        # one entry per schema path, with the hits of each profile using it
+        with self._lock:
+            return [
+                {
+                    "schema_path": schema_path,
+                    "compile_time": entry.compile_time,
+                    "compiles": entry.compiles,
+                    "hits": dict(entry.hits),
+                }
+                for schema_path, entry in self._entries.items()
+            ]
+
+
+schema_registry = SchemaRegistry()
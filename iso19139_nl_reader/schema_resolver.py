@@ -0,0 +1,98 @@
+import os
+from urllib.parse import urlparse
+import lxml.etree as et
+
+# schema locations published under another url than the one the bundled
+# copy is stored under (data/schema/<host>/<path>)
+URL_ALIASES = {
+    "schemas.opengis.net/iso/19139/20070417/": "standards.iso.org/ittf/PubliclyAvailableStandards/ISO_19139_Schemas/",
+    "www.isotc211.org/2005/": "standards.iso.org/ittf/PubliclyAvailableStandards/ISO_19139_Schemas/",
+    "schemas.opengis.net/gml/3.2.1/": "standards.iso.org/ittf/PubliclyAvailableStandards/ISO_19136_Schemas/",
+}
+NETWORK_SCHEMES = ("http", "https", "ftp")
+
+
+class SchemaNotBundledError(LookupError):
+    pass
+
+
+class SchemaResolver(et.Resolver):
+    # resolves schema urls to the bundled copies in schema_dir and serves
+    # bundled files from memory once read; unknown network resources are
+    # not fetched, they are recorded in missing so compilation can fail
+    # with a clear error
+    def __init__(self, schema_dir, documents=None):
+        super().__init__()
+        self.schema_dir = os.path.abspath(schema_dir)
+        self.documents = documents if documents is not None else {}
+        self.missing = []
+
+    def local_path(self, url):
+        parsed = urlparse(url)
+        if parsed.scheme in NETWORK_SCHEMES:
+            location = parsed.netloc + parsed.path
+            candidates = [location]
+            candidates.extend(
+                target + location[len(alias):] for alias, target in URL_ALIASES.items() if location.startswith(alias))
+            for candidate in candidates:
+                path = os.path.normpath(os.path.join(self.schema_dir, candidate))
+                if path.startswith(self.schema_dir + os.sep) and os.path.isfile(path):
+                    return path
+            return None
+        if parsed.scheme == "file":
+            url = parsed.path
+        path = os.path.abspath(url)
+        if path.startswith(self.schema_dir + os.sep):
+            return path
+        return None
+
+    def read(self, path):
+        data = self.documents.get(path)
+        if data is None:
+            with open(path, "rb") as schema_file:
+                data = schema_file.read()
+            # only bundled files are cached, they do not change
+            if path.startswith(self.schema_dir + os.sep):
+                self.documents[path] = data
+        return data
+
+    def resolve(self, url, public_id, context):
+        path = self.local_path(url)
+        if path is not None:
+            return self.resolve_string(self.read(path), context, base_url=path)
+        if urlparse(url).scheme in NETWORK_SCHEMES:
+            self.missing.append(url)
+            raise SchemaNotBundledError(url)
+        # local files outside the bundle are left to lxml
+        return None
+
+
+# bundled schema documents read so far, shared by all resolvers
+_documents = {}
+
+
+def schema_parser(schema_dir):
+    resolver = SchemaResolver(schema_dir, _documents)
+    parser = et.XMLParser(no_network=True)
+    parser.resolvers.add(resolver)
+    return parser, resolver
+
+
+def compile_schema(schema_path, schema_dir):
+    parser, resolver = schema_parser(schema_dir)
+    schema_path = os.path.abspath(schema_path)
+    schema_doc = et.XML(resolver.read(schema_path), parser, base_url=schema_path)
+    try:
+        schema = et.XMLSchema(schema_doc)
+    except et.XMLSchemaParseError as err:
+        if resolver.missing:
+            raise SchemaNotBundledError(f"schema resource not bundled: {', '.join(resolver.missing)}") from err
+        raise
+    # libxml2 only warns about imports it could not load
+    if resolver.missing:
+        raise SchemaNotBundledError(f"schema resource not bundled: {', '.join(resolver.missing)}")
+    return schema
+
+
+def clear_documents():
+    _documents.clear()
@@ -0,0 +1,53 @@
+import codecs
+import json
+import sys
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+FORMATS = ("pretty", "compact", "jsonl")
+BACKENDS = ("auto", "orjson", "stdlib")
+BUFFER_SIZE = 1024 * 1024
+
+
+def get_backend(backend="auto"):
+    if backend == "auto":
+        return "orjson" if orjson is not None else "stdlib"
+    if backend == "orjson" and orjson is None:
+        raise ValueError("json backend orjson is not installed")
+    return backend
+
+
+class JsonWriter():
+    # writes documents to a binary stream, pretty output keeps the stdlib
+    # layout (4 space indent), compact and jsonl output use the fast backend
+    # when available and write one document per line
+    def __init__(self, stream, output_format="pretty", backend="auto"):
+        if output_format not in FORMATS:
+            raise ValueError(f"unknown output format: {output_format}")
+        self.stream = stream
+        self.output_format = output_format
+        self.backend = get_backend(backend)
+        self._text_stream = codecs.getwriter("utf-8")(stream)
+
+    def write(self, document):
+        if self.output_format == "pretty":
+            # json.dump writes in chunks, no string for the whole document
+            json.dump(document, self._text_stream, indent=4)
+        elif self.backend == "orjson":
+            self.stream.write(orjson.dumps(document))
+        else:
+            json.dump(document, self._text_stream, ensure_ascii=False, separators=(",", ":"))
+        self.stream.write(b"\n")
+
+    def flush(self):
+        self.stream.flush()
+
+
+def open_output(path=None):
+    # buffered binary stream for stdout or a file
+    if path is None or path == "-":
+        return open(sys.stdout.fileno(), "wb", buffering=BUFFER_SIZE, closefd=False)
+    return open(path, "wb", buffering=BUFFER_SIZE)
@@ -0,0 +1,124 @@
+import io
+import lxml.etree as et
+from .util import scope_code_value
+from .xpath import NAMESPACES
+
+GMD = NAMESPACES["gmd"]
+MD_METADATA_TAG = f"{{{GMD}}}MD_Metadata"
+FILE_IDENTIFIER_TAG = f"{{{GMD}}}fileIdentifier"
+HIERARCHY_LEVEL_TAG = f"{{{GMD}}}hierarchyLevel"
+DATESTAMP_TAG = f"{{{GMD}}}dateStamp"
+IDENTIFICATION_INFO_TAG = f"{{{GMD}}}identificationInfo"
+DISTRIBUTION_INFO_TAG = f"{{{GMD}}}distributionInfo"
+PROTOCOL_TAG = f"{{{GMD}}}protocol"
+
+SNIFF_FIELDS = ("hierarchy_level", "file_identifier", "datestamp", "protocol")
+IDENTITY_FIELDS = ("file_identifier", "datestamp")
+# fileIdentifier, hierarchyLevel and dateStamp come before
+# identificationInfo in gmd:MD_Metadata, the protocol is in distributionInfo
+HEADER_TAGS = {
+    FILE_IDENTIFIER_TAG: "file_identifier",
+    HIERARCHY_LEVEL_TAG: "hierarchy_level",
+    DATESTAMP_TAG: "datestamp",
+}
+
+
+class RecordSummary():
+    __slots__ = SNIFF_FIELDS
+
+    def __init__(self, hierarchy_level=None, file_identifier=None, datestamp=None, protocol=None):
+        self.hierarchy_level = hierarchy_level
+        self.file_identifier = file_identifier
+        self.datestamp = datestamp
+        self.protocol = protocol
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def child_text(element):
+    for child in element:
+        return child.text
+    return None
+
+
+def scope_code(element):
+    for child in element:
+        return scope_code_value(child)
+    return None
+
+
+# iterparse reads a document given by path completely, a pull parser fed
+# in small chunks stops reading where the wanted elements are
+CHUNK_SIZE = 16 * 1024
+
+
+def iter_chunks(source):
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+    if hasattr(source, "read"):
+        yield from iter(lambda: source.read(CHUNK_SIZE), b"")
+        return
+    with open(source, "rb") as md_file:
+        yield from iter(lambda: md_file.read(CHUNK_SIZE), b"")
+
+
+def iter_events(source, tags):
+    parser = et.XMLPullParser(events=("start", "end"), tag=tags)
+    for chunk in iter_chunks(source):
+        parser.feed(chunk)
+        yield from parser.read_events()
+    parser.close()
+    yield from parser.read_events()
+
+
+def sniff(source, fields=SNIFF_FIELDS):
+    # returns a RecordSummary with the requested fields of a standalone
+    # metadata document (path, binary file object or bytes), reading stops
+    # as soon as they are known; the protocol is that of the first
+    # gmd:CI_OnlineResource in gmd:distributionInfo, as for ogc_service_type
+    summary = RecordSummary()
+    wanted = set(fields)
+    header_wanted = wanted & set(HEADER_TAGS.values())
+    tags = list(HEADER_TAGS) + [IDENTIFICATION_INFO_TAG]
+    if "protocol" in wanted:
+        tags.extend([DISTRIBUTION_INFO_TAG, PROTOCOL_TAG])
+    events = iter_events(source, tags)
+    in_distribution_info = False
+    try:
+        for event, element in events:
+            tag = element.tag
+            if tag == IDENTIFICATION_INFO_TAG:
+                if not wanted - header_wanted:
+                    break
+                if event == "end":
+                    # only the distribution info is needed from here on
+                    element.clear()
+            elif tag == DISTRIBUTION_INFO_TAG:
+                in_distribution_info = event == "start"
+            elif event != "end":
+                continue
+            elif tag == PROTOCOL_TAG:
+                if in_distribution_info:
+                    summary.protocol = child_text(element)
+                    wanted.discard("protocol")
+            elif element.getparent() is not None and element.getparent().tag == MD_METADATA_TAG:
+                name = HEADER_TAGS[tag]
+                if tag == HIERARCHY_LEVEL_TAG:
+                    value = scope_code(element)
+                else:
+                    value = child_text(element)
+                setattr(summary, name, value)
+                wanted.discard(name)
+                header_wanted.discard(name)
+            if not wanted:
+                break
+    finally:
+        events.close()
+    return summary
+
+
+def sniff_identity(source):
+    # (fileIdentifier, dateStamp), only the start of the document is parsed
+    summary = sniff(source, IDENTITY_FIELDS)
+    return summary.file_identifier, summary.datestamp
@@ -1,5 +1,21 @@
+import os
 from urllib.parse import urlparse
 
+GLOB_CHARS = ("*", "?", "[")
+
+
+def is_batch_source(path):
+    # a directory or glob pattern, as expanded by batch.collect_sources
+    return os.path.isdir(path) or any(char in path for char in GLOB_CHARS)
+
+
+def scope_code_value(scope_code):
+    # the record type of a gmd:MD_ScopeCode element, shared by the full parse
+    # and sniffing so both route a record the same way; records that only set
+    # @codeListValue are not converted
+    return scope_code.text
+
+
 def is_url(url):
     try:
         result = urlparse(url)
@@ -0,0 +1,175 @@
+import os
+import lxml.etree as et
+from .schema_registry import DEFAULT_PROFILE, schema_registry
+
+DEFAULT_MAX_ERRORS = 50
+EXECUTORS = ("thread", "process")
+
+
+class ValidationError():
+    __slots__ = ("line", "column", "path", "message")
+
+    def __init__(self, line, column, path, message):
+        self.line = line
+        self.column = column
+        self.path = path
+        self.message = message
+
+    @classmethod
+    def from_log_entry(cls, entry):
+        return cls(entry.line, entry.column, entry.path, entry.message)
+
+    @classmethod
+    def from_parse_error(cls, err):
+        # the document could not be read or is not well-formed XML
+        line, column = getattr(err, "position", (None, None))
+        return cls(line, column, None, f"{type(err).__name__}: {err}")
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def to_text(self):
+        return f"error: {self.message}, line: {self.line}, column {self.column}"
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.line}:{self.column} {self.path}: {self.message})"
+
+
+class ValidationResult():
+    # errors holds at most max_errors entries, error_count is the number of
+    # errors reported by the schema
+    __slots__ = ("source", "errors", "error_count")
+
+    def __init__(self, source, errors, error_count):
+        self.source = source
+        self.errors = errors
+        self.error_count = error_count
+
+    @property
+    def valid(self):
+        return self.error_count == 0
+
+    @property
+    def truncated(self):
+        return self.error_count > len(self.errors)
+
+    def to_dict(self):
+        return {
+            "source": self.source,
+            "valid": self.valid,
+            "error_count": self.error_count,
+            "errors": [error.to_dict() for error in self.errors],
+        }
+
+
+def collect_errors(error_log, max_errors=DEFAULT_MAX_ERRORS):
+    # (at most max_errors ValidationErrors, total number of errors); None
+    # means no limit
+    errors = []
+    count = 0
+    for entry in error_log:
+        count += 1
+        if max_errors is None or count <= max_errors:
+            errors.append(ValidationError.from_log_entry(entry))
+    return errors, count
+
+
+def format_errors(errors, error_count):
+    # the text layout of MetadataRecord.schema_validation_errors
+    lines = [""]
+    lines.extend(error.to_text() for error in errors)
+    if error_count > len(errors):
+        lines.append(f"... {error_count - len(errors)} more errors")
+    return "\n\t".join(lines)
+
+
+def worker_schema(profile=DEFAULT_PROFILE):
+    # the registry compiles a schema per thread
+    return schema_registry.get_schema(profile)
+
+
+def as_tree(source):
+    if isinstance(source, (et._Element, et._ElementTree)):
+        return source
+    if isinstance(source, (bytes, bytearray)):
+        return et.fromstring(bytes(source))
+    if hasattr(source, "etree"):
+        # a MetadataRecord
+        return source.etree
+    return et.parse(os.fspath(source))
+
+
+def source_name(source):
+    if isinstance(source, (str, os.PathLike)):
+        return os.fspath(source)
+    return None
+
+
+def validate_source(source, profile=DEFAULT_PROFILE, max_errors=DEFAULT_MAX_ERRORS):
+    # a source that cannot be parsed gives an invalid result with the parse
+    # error, so one bad document does not end a batch
+    schema = worker_schema(profile)
+    try:
+        tree = as_tree(source)
+    except (et.XMLSyntaxError, OSError) as err:
+        return ValidationResult(source_name(source), [ValidationError.from_parse_error(err)], 1)
+    if schema.validate(tree):
+        return ValidationResult(source_name(source), [], 0)
+    errors, count = collect_errors(schema.error_log, max_errors)
+    return ValidationResult(source_name(source), errors, count)
+
+
+class _ValidateSource():
+    # picklable callable for the process pool
+    def __init__(self, profile, max_errors):
+        self.profile = profile
+        self.max_errors = max_errors
+
+    def __call__(self, source):
+        return validate_source(source, self.profile, self.max_errors)
+
+
+def init_validation_worker(profile):
+    worker_schema(profile)
+
+
+class ValidationService():
+    # validates batches of documents in a pool of workers, each worker
+    # compiles the schema once; the thread pool takes parsed trees, records,
+    # bytes or paths (libxml2 validates without holding the GIL), the
+    # process pool takes bytes or paths
+    def __init__(self, profile=DEFAULT_PROFILE, workers=None, max_errors=DEFAULT_MAX_ERRORS, executor="thread"):
+        if executor not in EXECUTORS:
+            raise ValueError(f"unknown executor: {executor}")
+        self.profile = profile
+        self.workers = workers or os.cpu_count() or 1
+        self.max_errors = max_errors
+        self.executor_type = executor
+        self._task = _ValidateSource(profile, max_errors)
+        # concurrent.futures imports multiprocessing, which single record
+        # validation through MetadataRecord does not need
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+        if executor == "process":
+            self._executor = ProcessPoolExecutor(
+                self.workers, initializer=init_validation_worker, initargs=(profile,))
+        else:
+            self._executor = ThreadPoolExecutor(
+                self.workers, initializer=init_validation_worker, initargs=(profile,))
+
+    def validate(self, source):
+        return self._executor.submit(self._task, source).result()
+
+    def validate_batch(self, sources, chunksize=16):
+        # results are yielded in the order of sources
+        if self.executor_type == "process":
+            return self._executor.map(self._task, sources, chunksize=chunksize)
+        return self._executor.map(self._task, sources)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,38 @@
+import lxml.etree as et
+
+NAMESPACES = {
+    "csw": "http://www.opengis.net/cat/csw/2.0.2",
+    "gco": "http://www.isotc211.org/2005/gco",
+    "geonet": "http://www.fao.org/geonetwork",
+    "gmd": "http://www.isotc211.org/2005/gmd",
+    "gml": "http://www.opengis.net/gml",
+    "gmx": "http://www.isotc211.org/2005/gmx",
+    "gsr": "http://www.isotc211.org/2005/gsr",
+    "gts": "http://www.isotc211.org/2005/gts",
+    "srv": "http://www.isotc211.org/2005/srv",
+    "xlink": "http://www.w3.org/1999/xlink",
+}
+
+XPATH_METADATA = "/gmd:MD_Metadata"
+XPATH_RECORD_TYPE = f"{XPATH_METADATA}/gmd:hierarchyLevel/gmd:MD_ScopeCode"
+XPATH_RESOURCE_IDENTIFICATION = {
+    "service": f"{XPATH_METADATA}/gmd:identificationInfo/srv:SV_ServiceIdentification",
+    "dataset": f"{XPATH_METADATA}/gmd:identificationInfo/gmd:MD_DataIdentification",
+}
+
+# compiled XPath objects keyed by expression, getters build their
+# expressions from the resource identification path, so every expression is
+# compiled once per record type and then shared by all records in the process
+_compiled_xpaths = {}
+
+
+def get_xpath(expression):
+    xpath = _compiled_xpaths.get(expression)
+    if xpath is None:
+        xpath = _compiled_xpaths.setdefault(
+            expression, et.XPath(expression, namespaces=NAMESPACES))
+    return xpath
+
+
+def compiled_xpath_count():
+    return len(_compiled_xpaths)
@@ -51,7 +51,7 @@ setup(
     zip_safe=False,
     install_requires=install_requires,
     tests_require=tests_require,
-    extras_require={"test": tests_require},
+    extras_require={"test": tests_require, "fast": ["orjson"], "columnar": ["numpy", "pyarrow"]},
     entry_points={
         "console_scripts": [
             "read-iso=iso19139_nl_reader.cli:cli"
@@ -0,0 +1,36 @@
+from pathlib import Path
+import pytest
+from lxml import etree as et
+from iso19139_nl_reader.metadata_record import MetadataRecord
+
+EXAMPLE_DIR = Path(__file__).resolve().parent.parent / "example"
+NAMESPACES = {"gmd": "http://www.isotc211.org/2005/gmd"}
+
+
+@pytest.fixture
+def example_dir():
+    return EXAMPLE_DIR
+
+
+@pytest.fixture(params=sorted(EXAMPLE_DIR.glob("*.xml")), ids=lambda path: path.name)
+def example_path(request):
+    # runs the test once for every example document
+    return request.param
+
+
+@pytest.fixture
+def read_example():
+    # MetadataRecord of an example document, without the elements matched by
+    # the remove XPaths
+    def read(name, remove=()):
+        tree = et.parse(str(EXAMPLE_DIR / name))
+        for xpath in remove:
+            for element in tree.xpath(xpath, namespaces=NAMESPACES):
+                element.getparent().remove(element)
+        return MetadataRecord(etree=tree)
+    return read
+
+
+@pytest.fixture
+def record_without_license(read_example):
+    return read_example("iso19139-inspire.xml", ["//gmd:resourceConstraints"])
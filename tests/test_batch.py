@@ -0,0 +1,19 @@
+from iso19139_nl_reader.batch import validate_batch
+from iso19139_nl_reader.profiling import profiler
+from iso19139_nl_reader.schema_registry import schema_registry
+
+def test_warm_up_is_profiled(example_dir):
+    paths = [str(example_dir / "iso19139.xml"), str(example_dir / "19119_2.0.xml")]
+    schema_registry.clear()
+    profiler.reset()
+    profiler.enable()
+    try:
+        results = list(validate_batch(paths))
+        calls, seconds = profiler.timings["validate.schema_load"]
+    finally:
+        profiler.disable()
+        profiler.reset()
+    assert [result["file"] for result in results] == paths
+    # the warm-up compiles the schema, each document then looks it up
+    assert calls == len(paths) + 1
+    assert seconds >= schema_registry.stats()[0]["compile_time"]
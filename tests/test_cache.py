@@ -0,0 +1,47 @@
+from iso19139_nl_reader.batch import convert_bytes, read_batch, validate_bytes
+from iso19139_nl_reader.cache import ConversionCache, cache_key, read_kind
+
+def test_conversion_cache(tmp_path, example_dir):
+    data = (example_dir / "iso19139-inspire.xml").read_bytes()
+    cache = ConversionCache(str(tmp_path))
+    result = convert_bytes(data, cache)
+    assert result == convert_bytes(data)
+    assert convert_bytes(data, cache) == result
+    assert validate_bytes(data, cache=cache) == validate_bytes(data, cache=cache)
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (2, 2, 2)
+    cache.close()
+
+    # entries persist across instances, and differ per kind
+    cache = ConversionCache(str(tmp_path))
+    assert cache.get(cache_key(data, read_kind())) == result
+    assert cache.get(cache_key(data, read_kind(collect_issues=True))) is None
+    cache.close()
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ConversionCache(str(tmp_path), max_size=100)
+    for key in ("a", "b", "c"):
+        cache.put(key, "x" * 40)
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+    cache.put("d", "x" * 40)
+    assert cache.get("c") is None
+    assert cache.get("b") is not None
+    stats = cache.stats()
+    assert stats["evictions"] == 2
+    assert stats["size"] <= 100
+    cache.close()
+
+    # a smaller max_size applies on opening
+    cache = ConversionCache(str(tmp_path), max_size=50)
+    assert cache.stats()["entries"] == 1
+    cache.close()
+
+
+def test_batch_without_cache_dir_does_not_use_earlier_cache(tmp_path, example_dir):
+    paths = [str(example_dir / "iso19139-inspire.xml")]
+    assert list(read_batch(paths, cache_dir=str(tmp_path))) == list(read_batch(paths))
+    cache = ConversionCache(str(tmp_path))
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (0, 1)
+    cache.close()
@@ -0,0 +1,42 @@
+import json
+import subprocess
+import sys
+import pytest
+from click.testing import CliRunner
+from iso19139_nl_reader.cli import cli
+
+
+@pytest.mark.parametrize("command", ["read", "validate"])
+def test_missing_file_is_usage_error(tmp_path, command):
+    path = str(tmp_path / "missing.xml")
+    result = CliRunner().invoke(cli, [command, path])
+    assert result.exit_code == 2
+    assert f"Invalid value for 'MD_FILES': '{path}': No such file or directory" in result.output
+
+
+@pytest.mark.parametrize("command", ["read", "validate", "sniff"])
+def test_pattern_without_documents_is_usage_error(tmp_path, command):
+    for pattern in (str(tmp_path / "*.xml"), str(tmp_path)):
+        result = CliRunner().invoke(cli, [command, pattern])
+        assert result.exit_code == 2
+        assert f"'{pattern}': no metadata documents found" in result.output
+
+
+def test_validate_single_file_output(tmp_path, example_dir):
+    output = tmp_path / "result.json"
+    result = CliRunner().invoke(cli, ["validate", str(example_dir / "iso19139.xml"), "-o", str(output)])
+    assert result.exit_code == 0
+    assert json.loads(output.read_text()) == {"valid": True, "errors": ""}
+
+
+@pytest.mark.parametrize("command", ["read", "validate"])
+def test_single_file_skips_batch_imports(example_dir, command):
+    code = (
+        "import sys\n"
+        "from iso19139_nl_reader.cli import cli\n"
+        f"cli.main([{command!r}, {str(example_dir / '19119_2.0.xml')!r}], standalone_mode=False)\n"
+        "print(sorted({'iso19139_nl_reader.batch', 'iso19139_nl_reader.cache', 'multiprocessing', 'sqlite3',\n"
+        "              'concurrent.futures'} & set(sys.modules)))\n")
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=example_dir.parent)
+    assert result.stdout.splitlines()[-1] == "[]"
@@ -0,0 +1,19 @@
+import math
+from iso19139_nl_reader.columnar import ColumnarExport
+
+def test_columnar_export(read_example):
+    records = [read_example(name) for name in ("19119_2.0.xml", "iso19139-inspire.xml")]
+    export = ColumnarExport().extend(records)
+    assert export.count == 2
+    assert export.strings["md_identifier"] == [record.metadata_id for record in records]
+    assert list(export.bbox[4:]) == [3.30, 50.73, 7.24, 53.60]
+    assert export.categoricals["record_type"].categories == ["service", "dataset"]
+    assert export.linked_datasets.record.tolist() == [0]
+
+
+def test_missing_bbox_is_nan(read_example):
+    record = read_example("iso19139.xml", ["//gmd:EX_GeographicBoundingBox/*"])
+    export = ColumnarExport().extend([record])
+    assert all(math.isnan(value) for value in export.bbox)
+    assert export.strings["title"] == [record.get_field("title")]
+    assert record.strict
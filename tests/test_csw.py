@@ -0,0 +1,65 @@
+import json
+from pathlib import Path
+import pytest
+from click.testing import CliRunner
+from iso19139_nl_reader.cli import cli
+from iso19139_nl_reader.csw import iter_csw_responses
+from iso19139_nl_reader.linkgraph import LinkGraph
+
+PAGE_NAMES = ("19119_2.0.xml", "iso19139-inspire.xml")
+
+
+def get_records_response(example_dir, names):
+    records = []
+    for name in names:
+        data = (example_dir / name).read_bytes()
+        if data.startswith(b"<?xml"):
+            data = data[data.index(b"?>") + 2:]
+        records.append(data)
+    return (
+        b'<?xml version="1.0" encoding="UTF-8"?>\n'
+        b'<csw:GetRecordsResponse xmlns:csw="http://www.opengis.net/cat/csw/2.0.2">'
+        b'<csw:SearchResults numberOfRecordsMatched="2" numberOfRecordsReturned="2">'
+        + b"".join(records) + b"</csw:SearchResults></csw:GetRecordsResponse>")
+
+
+@pytest.fixture
+def response_dir(tmp_path, example_dir):
+    response_dir = tmp_path / "responses"
+    response_dir.mkdir()
+    page = get_records_response(example_dir, PAGE_NAMES)
+    (response_dir / "page-1.xml").write_bytes(page)
+    # the second record is cut off half way
+    (response_dir / "page-2.xml").write_bytes(page[:len(page) * 3 // 4])
+    return response_dir
+
+
+def test_iter_csw_responses(response_dir):
+    results = [(Path(response).name, record.metadata_id if record else None, error is not None)
+               for response, record, error in iter_csw_responses([str(response_dir)])]
+    assert results == [
+        ("page-1.xml", "b4ae5b2c-f557-4a30-bbf2-c2681a544f32", False),
+        ("page-1.xml", "5951efa2-1ff3-4763-a966-a2f5497679ee", False),
+        ("page-2.xml", "b4ae5b2c-f557-4a30-bbf2-c2681a544f32", False),
+        ("page-2.xml", None, True),
+    ]
+
+
+def test_read_csw_reports_broken_response(tmp_path, response_dir):
+    output = tmp_path / "records.jsonl"
+    result = CliRunner().invoke(cli, ["read-csw", str(response_dir), "-o", str(output)])
+    assert result.exit_code == 1
+    lines = [json.loads(line) for line in output.read_text().splitlines()]
+    assert ["result" in line for line in lines] == [True, True, True, False]
+    assert lines[-1]["file"] == str(response_dir / "page-2.xml")
+    assert lines[-1]["error"].startswith("XMLSyntaxError")
+
+
+def test_link_graph_csw_saves_index(tmp_path, response_dir):
+    index_file = tmp_path / "links.json"
+    output = tmp_path / "report.json"
+    result = CliRunner().invoke(cli, ["link-graph", str(index_file), str(response_dir), "--csw", "-o", str(output)])
+    assert result.exit_code == 0
+    report = json.loads(output.read_text())
+    assert [failure["file"] for failure in report["failed"]] == [str(response_dir / "page-2.xml")]
+    assert LinkGraph.load(str(index_file)).stats()["services"] == 1
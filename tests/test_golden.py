@@ -0,0 +1,20 @@
+import json
+from pathlib import Path
+from iso19139_nl_reader.metadata_record import MetadataRecord
+
+GOLDEN_DIR = Path(__file__).resolve().parent / "data" / "golden"
+
+
+def convert(path):
+    try:
+        return {"result": MetadataRecord.from_path(str(path)).convert_to_dictionary()}
+    except Exception as err:
+        return {"error": f"{type(err).__name__}: {err}"}
+
+
+def test_output_matches_baseline(example_path):
+    path = example_path
+    # the golden files hold the output of the baseline release; comparing the
+    # serialized text checks key order as well as values
+    expected = (GOLDEN_DIR / f"{path.stem}.json").read_text(encoding="utf-8")
+    assert json.dumps(convert(path), indent=4, ensure_ascii=False) + "\n" == expected
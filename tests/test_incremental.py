@@ -0,0 +1,46 @@
+import json
+import shutil
+import pytest
+from click.testing import CliRunner
+from iso19139_nl_reader.cli import cli
+from iso19139_nl_reader.incremental import ADDED, CHANGED, FAILED, HarvestIndex, diff_harvest
+
+
+@pytest.fixture
+def harvest_dir(tmp_path, example_dir):
+    harvest_dir = tmp_path / "harvest"
+    harvest_dir.mkdir()
+    for name in ("19119_2.0.xml", "iso19139-inspire.xml"):
+        shutil.copy(example_dir / name, harvest_dir / name)
+    (harvest_dir / "bad.xml").write_text("<gmd:MD_Metadata")
+    return harvest_dir
+
+
+def test_diff_harvest_reports_failed_sources(harvest_dir):
+    sources = sorted(str(path) for path in harvest_dir.glob("*.xml"))
+    changes = list(diff_harvest(sources + [str(harvest_dir / "missing.xml")], HarvestIndex()))
+    assert [change for change, *_ in changes] == [ADDED, FAILED, ADDED, FAILED]
+
+
+def read_incremental(index_file, harvest_dir, output):
+    result = CliRunner().invoke(cli, ["read-incremental", str(index_file), str(harvest_dir), "-o", str(output)])
+    return result.exit_code, [json.loads(line) for line in output.read_text().splitlines()]
+
+
+def test_read_incremental_saves_index_despite_bad_file(tmp_path, example_dir, harvest_dir):
+    index_file = tmp_path / "index.json"
+    output = tmp_path / "changes.jsonl"
+    exit_code, lines = read_incremental(index_file, harvest_dir, output)
+    assert exit_code == 1
+    assert [line["change"] for line in lines] == [FAILED, ADDED, ADDED]
+    assert len(HarvestIndex.load(str(index_file)).entries) == 2
+
+    (harvest_dir / "iso19139-inspire.xml").write_text(
+        (example_dir / "iso19139-inspire.xml").read_text().replace("2021-08-31", "2022-01-01"))
+    exit_code, lines = read_incremental(index_file, harvest_dir, output)
+    assert [line["change"] for line in lines] == [FAILED, CHANGED]
+
+    (harvest_dir / "19119_2.0.xml").write_text("<gmd:MD_Metadata")
+    exit_code, lines = read_incremental(index_file, harvest_dir, output)
+    assert [line["change"] for line in lines] == [FAILED, FAILED]
+    assert len(HarvestIndex.load(str(index_file)).entries) == 2
@@ -0,0 +1,24 @@
+import pytest
+from iso19139_nl_reader.columnar import ColumnarExport
+from iso19139_nl_reader.issues import ERROR, LICENSE
+from iso19139_nl_reader.linkgraph import build_link_graph
+
+
+def test_convert_with_issues(record_without_license):
+    result, issues = record_without_license.convert_with_issues()
+    assert result["title"] == "Vervoersnetwerken - Waterwegen (INSPIRE geharmoniseerd)"
+    assert result["license"] is None
+    assert [(issue.severity, issue.category, issue.field) for issue in issues] == [(ERROR, LICENSE, "license")]
+
+
+@pytest.mark.parametrize("convert", [
+    lambda record: record.convert_with_issues(),
+    lambda record: ColumnarExport().add(record),
+    lambda record: build_link_graph([record]),
+])
+def test_strict_mode_is_restored(convert, record_without_license):
+    record = record_without_license
+    convert(record)
+    assert record.strict
+    with pytest.raises(ValueError, match="unable to determine license"):
+        record.convert_to_dictionary()
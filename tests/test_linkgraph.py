@@ -0,0 +1,73 @@
+import json
+from click.testing import CliRunner
+from iso19139_nl_reader.cli import cli
+from iso19139_nl_reader.linkgraph import LinkGraph, build_link_graph
+
+SERVICE_ID = "b4ae5b2c-f557-4a30-bbf2-c2681a544f32"
+DATASET_ID = "831f7bd7-c2ae-4336-bd2f-47ab20d7cdb7"
+SOURCE_ID = "2cfb54f9-a807-49d1-b010-615171e4c8b2"
+
+
+def test_build_link_graph(tmp_path, read_example):
+    names = ("19119_2.0.xml", "iso19139-inspire.xml", "iso19139.xml")
+    graph, skipped = build_link_graph([read_example(name) for name in names])
+    assert skipped == 0
+    assert graph.stats() == {"services": 1, "datasets": 2, "links": 1, "linked_datasets": 1}
+    assert graph.datasets_for_service(SERVICE_ID.upper()) == [DATASET_ID]
+    assert graph.services_for_dataset(DATASET_ID) == [SERVICE_ID]
+    assert [link["dataset_md_identifier"] for link in graph.dangling()] == [DATASET_ID]
+
+    path = str(tmp_path / "graph.json")
+    graph.save(path)
+    loaded = LinkGraph.load(path)
+    assert loaded.report() == graph.report()
+    assert loaded.services_for_dataset(DATASET_ID) == [SERVICE_ID]
+
+
+def test_link_graph_updates():
+    graph = LinkGraph()
+    graph.set_service(SERVICE_ID, [(DATASET_ID, SOURCE_ID)])
+    graph.set_dataset(DATASET_ID, "other-resource-id")
+    assert list(graph.dangling()) == []
+    assert [link["resource_identifier"] for link in graph.mismatched()] == ["other-resource-id"]
+    graph.set_dataset(DATASET_ID, SOURCE_ID.upper())
+    assert list(graph.mismatched()) == []
+
+    # changed links replace the earlier ones
+    graph.set_service(SERVICE_ID, [])
+    assert graph.services_for_dataset(DATASET_ID) == []
+    graph.remove(DATASET_ID)
+    assert graph.stats() == {"services": 1, "datasets": 0, "links": 0, "linked_datasets": 0}
+
+
+def test_record_changing_type(read_example):
+    service, dataset = read_example("19119_2.0.xml"), read_example("iso19139.xml")
+    dataset.metadata_id = service.metadata_id
+    graph, _ = build_link_graph([dataset, service])
+    assert graph.stats() == {"services": 1, "datasets": 0, "links": 1, "linked_datasets": 1}
+    graph.add_record(dataset)
+    assert graph.stats() == {"services": 0, "datasets": 1, "links": 0, "linked_datasets": 0}
+
+
+def test_records_without_identifier_are_skipped(tmp_path, read_example):
+    service, dataset = read_example("19119_2.0.xml"), read_example("iso19139.xml")
+    service.metadata_id = None
+    dataset.metadata_id = " "
+    graph, skipped = build_link_graph([service, dataset])
+    assert skipped == 2
+    assert graph.stats() == {"services": 0, "datasets": 0, "links": 0, "linked_datasets": 0}
+
+
+def test_link_graph_command_removes_deleted_records(tmp_path, example_dir):
+    index_file = str(tmp_path / "links.json")
+    output = tmp_path / "report.json"
+    runner = CliRunner()
+    runner.invoke(cli, ["link-graph", index_file, str(example_dir / "19119_2.0.xml"),
+                        str(example_dir / "iso19139.xml"), "-o", str(output)])
+    assert json.loads(output.read_text())["links"] == 1
+    result = runner.invoke(cli, ["link-graph", index_file, "--remove", SERVICE_ID.upper(),
+                                 "--remove", "fff94270-b5ce-4ed9-ae99-5f96096ac08d", "-o", str(output)])
+    assert result.exit_code == 0
+    report = json.loads(output.read_text())
+    assert (report["services"], report["datasets"], report["dangling"]) == (0, 0, [])
+    assert LinkGraph.load(index_file).stats()["links"] == 0
@@ -0,0 +1,28 @@
+from iso19139_nl_reader.model import BBox, Contact, License, Thumbnail, model_list
+
+
+def test_converters_keep_none():
+    assert BBox.from_dict(None) is None
+    assert Contact.from_dict(None) is None
+    assert License.from_dict(None) is None
+    assert model_list(Thumbnail)(None) is None
+
+
+def test_non_strict_record_with_missing_license(record_without_license):
+    record = record_without_license
+    record.strict = False
+    model = record.convert_to_record()
+    assert model.license is None
+    assert model.title == "Vervoersnetwerken - Waterwegen (INSPIRE geharmoniseerd)"
+    assert [issue.field for issue in record.issues] == ["license"]
+    assert model.to_dict()["license"] is None
+
+
+def test_to_dict_matches_convert_to_dictionary(read_example):
+    for name in ("19119_2.0.xml", "iso19139-inspire.xml"):
+        record = read_example(name)
+        expected = record.convert_to_dictionary()
+        expected["bbox"] = {key: float(value) for key, value in expected["bbox"].items()}
+        result = record.convert_to_record().to_dict()
+        assert list(result) == list(expected)
+        assert result == expected
@@ -0,0 +1,17 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from iso19139_nl_reader.pipeline import convert_many
+
+async def collect(sources, **kwargs):
+    return [result async for result in convert_many(sources, **kwargs)]
+
+
+def test_failing_sources_do_not_stall(example_dir):
+    paths = [str(path) for path in sorted(example_dir.glob("*.xml"))]
+    sources = paths[:2] + [None, "does-not-exist.xml"] + paths[2:]
+    with ThreadPoolExecutor(2) as executor:
+        results = asyncio.run(asyncio.wait_for(collect(sources, concurrency=2, executor=executor), 30))
+    assert [result["file"] for result in results] == [str(source) for source in sources]
+    assert results[2]["error"].startswith("TypeError")
+    assert results[3]["error"].startswith("FileNotFoundError")
+    assert "result" in results[-2]
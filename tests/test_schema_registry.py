@@ -0,0 +1,40 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from iso19139_nl_reader.metadata_record import MetadataRecord
+from iso19139_nl_reader.schema_registry import SchemaRegistry
+
+
+def test_schema_per_thread():
+    registry = SchemaRegistry()
+    schema = registry.get_schema("gmd")
+    assert registry.get_schema("gmd") is schema
+    with ThreadPoolExecutor(1) as executor:
+        other = executor.submit(registry.get_schema, "gmd").result()
+    assert other is not schema
+    stats = registry.stats()
+    assert stats[0]["compiles"] == 2
+    assert stats[0]["hits"] == {"gmd": 1}
+
+
+def test_profiles_share_schema_path():
+    registry = SchemaRegistry()
+    registry.warm_up()
+    assert registry.get_schema("nl-2.0") is registry.get_schema("apiso")
+    stats = {Path(entry["schema_path"]).name: entry for entry in registry.stats()}
+    assert sorted(stats) == ["apiso.xsd", "gmd.xsd", "srv.xsd"]
+    assert [entry["compiles"] for entry in stats.values()] == [1, 1, 1]
+    assert stats["apiso.xsd"]["hits"] == {"apiso": 1, "nl-1.2": 1, "nl-2.0": 2}
+
+
+def test_concurrent_validation_errors(example_dir):
+    paths = sorted(example_dir.glob("*.xml"))
+    expected = {path: MetadataRecord.from_path(path).schema_validation_errors() for path in paths}
+    assert any(expected.values())
+
+    def validate(path):
+        return path, MetadataRecord.from_path(path).schema_validation_errors()
+
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(validate, paths * 20))
+    for path, errors in results:
+        assert errors == expected[path]
@@ -0,0 +1,32 @@
+import io
+import pytest
+from iso19139_nl_reader.metadata_record import MetadataRecord
+from iso19139_nl_reader.sniff import sniff, sniff_identity
+
+
+def test_sniff_matches_full_parse(example_path):
+    path = example_path
+    data = path.read_bytes()
+    record = MetadataRecord.from_bytes(data)
+    summary = sniff(str(path))
+    assert summary.hierarchy_level == record.record_type
+    assert summary.file_identifier == record.metadata_id
+    assert summary.datestamp == record.get_field("datestamp")
+    assert sniff(data).to_dict() == summary.to_dict()
+    assert sniff(io.BytesIO(data)).to_dict() == summary.to_dict()
+    assert sniff_identity(str(path)) == (summary.file_identifier, summary.datestamp)
+
+
+def test_sniff_protocol(example_dir):
+    summary = sniff(str(example_dir / "19119_2.0.xml"))
+    assert (summary.hierarchy_level, summary.protocol) == ("service", "OGC:WFS")
+
+
+def test_sniff_stops_after_header(example_dir):
+    # a document broken after the header still gives the header fields
+    data = (example_dir / "iso19139.xml").read_bytes()
+    start = data.index(b"<gmd:identificationInfo")
+    truncated = data[:start + len(b"<gmd:identificationInfo>")] + b"<broken"
+    assert sniff_identity(truncated) == ("fff94270-b5ce-4ed9-ae99-5f96096ac08d", "2021-07-01")
+    with pytest.raises(Exception):
+        sniff(truncated)
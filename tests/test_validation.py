@@ -0,0 +1,36 @@
+import pytest
+from iso19139_nl_reader.metadata_record import MetadataRecord
+from iso19139_nl_reader.validation import ValidationService, validate_source
+
+VALID = "iso19139.xml"
+INVALID = "iso19139-inspire.xml"
+
+
+def test_max_errors(example_dir):
+    invalid = str(example_dir / INVALID)
+    result = validate_source(invalid, max_errors=None)
+    assert (result.valid, result.error_count, len(result.errors), result.truncated) == (False, 2, 2, False)
+    limited = validate_source(invalid, max_errors=1)
+    assert (limited.error_count, limited.truncated) == (2, True)
+    assert limited.errors[0].to_dict() == result.errors[0].to_dict()
+    assert limited.errors[0].line is not None
+
+    text = MetadataRecord.from_path(invalid).schema_validation_errors(max_errors=1)
+    assert text.split("\n\t") == ["", limited.errors[0].to_text(), "... 1 more errors"]
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_validation_service(tmp_path, example_dir, executor):
+    valid, invalid = str(example_dir / VALID), str(example_dir / INVALID)
+    bad = tmp_path / "bad.xml"
+    bad.write_text("<gmd:MD_Metadata xmlns:gmd=\"http://www.isotc211.org/2005/gmd\">\n<broken")
+    sources = [valid, str(bad), invalid, str(tmp_path / "missing.xml"), valid]
+    with ValidationService(workers=2, max_errors=1, executor=executor) as service:
+        results = list(service.validate_batch(sources))
+        assert service.validate(valid).valid
+    assert [result.source for result in results] == sources
+    assert [result.valid for result in results] == [True, False, False, False, True]
+    assert results[1].errors[0].line == 2
+    assert results[1].errors[0].message.startswith("XMLSyntaxError")
+    assert results[2].truncated
+    assert results[3].errors[0].message.startswith("OSError")